@@ -0,0 +1,482 @@
+"""Load test and latency benchmark for every /api route.
+
+Seeds a scratch MongoDB database with realistic volumes of users,
+complaints, worker logs and notifications, then drives the FastAPI app
+in-process (httpx ASGI transport) route by route with concurrent requests.
+For each route it reports p50/p95/p99 latency, requests per second and the
+number of MongoDB commands issued per request, counted with a pymongo
+command listener.
+
+Results can be written as a JSON baseline and later runs compared against
+it; the run fails if a route's p95 latency or DB operations per request
+regress past the threshold.
+
+Runs against the MongoDB in MONGO_URL. The database named by --db is
+dropped before seeding and after the run, so it must end in a scratch
+suffix (_bench, _test or _scratch) and must not be the DB_NAME configured
+in backend/.env.
+
+    MONGO_URL=mongodb://localhost:27017 \\
+        python backend/benchmarks/api_load.py --db api_bench --write-baseline
+    MONGO_URL=mongodb://localhost:27017 \\
+        python backend/benchmarks/api_load.py --db api_bench --check --threshold 0.25
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from pathlib import Path
+
+from dotenv import dotenv_values
+from PIL import Image
+from pymongo import monitoring
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+SCRATCH_SUFFIXES = ("_bench", "_test", "_scratch")
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "endSessions", "saslStart", "saslContinue", "buildInfo"}
+
+# Long-lived streams have no meaningful per-request latency
+SKIPPED_ROUTES = {
+    "GET /api/notifications/stream": "long-lived Server-Sent Events stream",
+}
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        if event.command_name not in IGNORED_COMMANDS:
+            with self._lock:
+                self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Must be registered before server.py creates its client
+command_counter = CommandCounter()
+monitoring.register(command_counter)
+
+os.environ.setdefault("ADMIN_EMAIL", "admin@bench.vnit.ac.in")
+os.environ.setdefault("ADMIN_PASSWORD", "benchmark-admin")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import httpx  # noqa: E402
+
+# Imported in main() once --db has been checked, so server.py connects to it
+server = None
+
+CATEGORIES = {
+    "Electrical": ["Fan not working", "Light not working", "AC not working", "Power outage"],
+    "Plumbing": ["Leaking tap", "Clogged drain", "No water supply", "Broken pipe"],
+    "Cleaning": ["Garbage not collected", "Dirty common area", "Washroom uncleaned"],
+    "Carpentry": ["Broken door", "Window not closing", "Broken furniture"],
+}
+SPECIALIZATIONS = {"Electrical": "electrician", "Plumbing": "plumber", "Cleaning": "cleaner", "Carpentry": "carpenter"}
+FLOORS = [str(floor) for floor in range(1, 9)]
+STATUSES = ["Pending", "Assigned", "In Progress", "Completed - Awaiting Admin Review", "Completed", "Rejected"]
+PASSWORD = "benchmark-password"
+
+
+def png_bytes() -> bytes:
+    output = BytesIO()
+    Image.new("RGB", (640, 480), (200, 30, 30)).save(output, format="PNG")
+    return output.getvalue()
+
+
+class Context:
+    def __init__(self):
+        self.admins = []
+        self.workers = []
+        self.residents = []
+        self.pending = []
+        self.assigned = []
+        self.awaiting_review = []
+        self.notifications = []
+        self.media_id = None
+        self.png = png_bytes()
+        self.run_id = uuid.uuid4().hex[:8]
+
+    def headers(self, user: dict) -> dict:
+        return {"Authorization": f"Bearer {server.create_access_token({'sub': user['id']})}"}
+
+    def pick(self, items: list, i: int):
+        return items[i % len(items)]
+
+
+async def seed(args, ctx: Context):
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    password_hash = server.pwd_context.hash(PASSWORD)
+    admin_hash = server.pwd_context.hash(os.environ["ADMIN_PASSWORD"])
+
+    def user(role, index, **extra):
+        doc = server.User(
+            email=os.environ["ADMIN_EMAIL"] if role == "admin" and index == 0 else f"{role}{index}@bench.vnit.ac.in",
+            full_name=f"{role.title()} {index}",
+            role=role,
+            **extra
+        ).model_dump()
+        doc["password_hash"] = admin_hash if role == "admin" else password_hash
+        return doc
+
+    ctx.admins = [user("admin", i) for i in range(args.admins)]
+    ctx.workers = [
+        user("worker", i, specialization=list(SPECIALIZATIONS.values())[i % len(SPECIALIZATIONS)])
+        for i in range(args.workers)
+    ]
+    ctx.residents = [
+        user("resident", i, floor=rng.choice(FLOORS), room=str(100 + i % 50))
+        for i in range(args.residents)
+    ]
+    await server.db.users.insert_many([dict(u) for u in ctx.admins + ctx.workers + ctx.residents])
+
+    complaints = []
+    for i in range(args.complaints):
+        category = rng.choice(list(CATEGORIES))
+        status = rng.choice(STATUSES)
+        created = now - timedelta(hours=rng.uniform(1, 24 * 180))
+        resident = rng.choice(ctx.residents)
+        doc = server.Complaint(
+            resident_id=resident["id"],
+            complaint_type=rng.choice(["common_area", "personal_room"]),
+            floor=resident["floor"],
+            room=resident["room"],
+            category=category,
+            subcategory=rng.choice(CATEGORIES[category]),
+            description="Seeded complaint " + "x" * rng.randint(20, 400),
+            status=status,
+            assigned_to=rng.choice(ctx.workers)["id"] if status != "Pending" else None
+        ).model_dump()
+        doc["created_at"] = created
+        doc["updated_at"] = created + timedelta(hours=1)
+        if doc["assigned_to"]:
+            doc["assigned_at"] = created + timedelta(minutes=30)
+        if status == "Completed":
+            doc["resolved_at"] = created + timedelta(hours=rng.uniform(1, 240))
+        complaints.append(doc)
+    await server.db.complaints.insert_many([dict(c) for c in complaints])
+
+    ctx.pending = [c for c in complaints if c["status"] == "Pending"]
+    ctx.assigned = [c for c in complaints if c["status"] in ("Assigned", "In Progress")]
+    ctx.awaiting_review = [c for c in complaints if c["status"] == "Completed - Awaiting Admin Review"]
+
+    logs = []
+    for i in range(args.logs):
+        complaint = rng.choice(complaints)
+        worker_id = complaint["assigned_to"] or rng.choice(ctx.workers)["id"]
+        logs.append({
+            **server.WorkerLog(
+                worker_id=worker_id,
+                actor_id=worker_id,
+                complaint_id=complaint["id"],
+                action=rng.choice(["In Progress", "Resolved", "Cannot be Resolved"])
+            ).model_dump(),
+            "created_at": now - timedelta(hours=rng.uniform(1, 24 * 180))
+        })
+    if logs:
+        await server.db.worker_logs.insert_many(logs)
+    await server.rebuild_worker_rollups()
+
+    notifications = []
+    for i in range(args.notifications):
+        recipient = rng.choice(ctx.admins + ctx.workers + ctx.residents)
+        is_read = rng.random() < 0.7
+        notifications.append({
+            **server.NotificationModel(
+                user_id=recipient["id"],
+                complaint_id=rng.choice(complaints)["id"],
+                title="Seeded",
+                message="Seeded notification",
+                is_read=is_read,
+                read_at=now if is_read else None
+            ).model_dump(),
+            "created_at": now - timedelta(hours=rng.uniform(1, 24 * 180))
+        })
+    if notifications:
+        await server.db.notifications.insert_many([dict(n) for n in notifications])
+    await server.rebuild_unread_counters()
+    ctx.notifications = notifications
+
+    media = await server.externalize_media(
+        "data:image/png;base64," + base64.b64encode(ctx.png).decode(), ctx.admins[0]["id"]
+    )
+    ctx.media_id = media["media_id"]
+
+
+def scenarios(ctx: Context) -> list:
+    # (route, build(i) -> (method, url, request kwargs)); route matches the app's path template
+    def admin(i):
+        return ctx.headers(ctx.admins[0])
+
+    def resident(i):
+        return ctx.headers(ctx.pick(ctx.residents, i))
+
+    def worker_for(complaint):
+        return ctx.headers({"id": complaint["assigned_to"]})
+
+    return [
+        ("POST /api/auth/register", lambda i: ("POST", "/api/auth/register", {"json": {
+            "email": f"new{ctx.run_id}{i}@bench.vnit.ac.in", "full_name": f"New {i}", "role": "resident",
+            "password": PASSWORD, "floor": "1", "room": "101"
+        }})),
+        ("POST /api/auth/login", lambda i: ("POST", "/api/auth/login", {"json": {
+            "email": ctx.pick(ctx.residents, i)["email"], "password": PASSWORD
+        }})),
+        ("GET /api/auth/me", lambda i: ("GET", "/api/auth/me", {"headers": resident(i)})),
+        ("POST /api/auth/query-token", lambda i: ("POST", "/api/auth/query-token", {"headers": resident(i)})),
+        ("GET /api/health", lambda i: ("GET", "/api/health", {})),
+        ("GET /api/ready", lambda i: ("GET", "/api/ready", {})),
+        ("GET /api/resident/complaints", lambda i: ("GET", "/api/resident/complaints", {"headers": resident(i)})),
+        ("POST /api/resident/complaints", lambda i: ("POST", "/api/resident/complaints", {
+            "headers": resident(i),
+            "json": {
+                "complaint_type": "common_area", "floor": ctx.pick(FLOORS, i),
+                "category": "Cleaning", "subcategory": "Washroom uncleaned", "description": "Benchmark"
+            }
+        })),
+        ("GET /api/admin/complaints", lambda i: ("GET", "/api/admin/complaints", {"headers": admin(i)})),
+        ("GET /api/admin/complaints/search", lambda i: (
+            "GET", "/api/admin/complaints/search",
+            {"headers": admin(i), "params": {"q": ctx.pick(["leaking", "light", "broken door", "plumbing"], i), "status": "Pending"}}
+        )),
+        ("GET /api/admin/workers", lambda i: ("GET", "/api/admin/workers", {"headers": admin(i)})),
+        ("PUT /api/admin/complaints/{complaint_id}/approve", lambda i: (
+            "PUT", f"/api/admin/complaints/{ctx.pick(ctx.pending, i)['id']}/approve",
+            {"headers": admin(i), "data": {"worker_id": ctx.pick(ctx.workers, i)["id"]}}
+        )),
+        ("PUT /api/admin/complaints/{complaint_id}/reject", lambda i: (
+            "PUT", f"/api/admin/complaints/{ctx.pick(ctx.pending, -i - 1)['id']}/reject",
+            {"headers": admin(i), "data": {"rejection_reason": "Benchmark"}}
+        )),
+        ("POST /api/admin/complaints/bulk-approve", lambda i: ("POST", "/api/admin/complaints/bulk-approve", {
+            "headers": admin(i),
+            "json": {"items": [
+                {"complaint_id": ctx.pick(ctx.pending, 2 * i * 25 + k)["id"], "worker_id": ctx.pick(ctx.workers, k)["id"]}
+                for k in range(25)
+            ]}
+        })),
+        ("POST /api/admin/complaints/bulk-reject", lambda i: ("POST", "/api/admin/complaints/bulk-reject", {
+            "headers": admin(i),
+            "json": {"items": [
+                {"complaint_id": ctx.pick(ctx.pending, (2 * i + 1) * 25 + k)["id"], "rejection_reason": "Benchmark"}
+                for k in range(25)
+            ]}
+        })),
+        ("PUT /api/admin/complaints/{complaint_id}/review", lambda i: (
+            "PUT", f"/api/admin/complaints/{ctx.pick(ctx.awaiting_review, i)['id']}/review",
+            {"headers": admin(i), "data": {"action": "RequestedChanges" if i % 2 else "Completed"}}
+        )),
+        ("GET /api/admin/complaints/{complaint_id}/recommended-worker", lambda i: (
+            "GET", f"/api/admin/complaints/{ctx.pick(ctx.pending, i)['id']}/recommended-worker", {"headers": admin(i)}
+        )),
+        ("PUT /api/admin/complaints/{complaint_id}/auto-assign", lambda i: (
+            "PUT", f"/api/admin/complaints/{ctx.pick(ctx.pending, i + 1)['id']}/auto-assign", {"headers": admin(i)}
+        )),
+        ("POST /api/admin/complaints/assign-pending", lambda i: (
+            "POST", "/api/admin/complaints/assign-pending", {"headers": admin(i), "params": {"limit": 20}}
+        )),
+        ("GET /api/admin/analytics", lambda i: ("GET", "/api/admin/analytics", {"headers": admin(i)})),
+        ("POST /api/admin/analytics/rebuild", lambda i: ("POST", "/api/admin/analytics/rebuild", {"headers": admin(i)})),
+        ("GET /api/admin/stats", lambda i: ("GET", "/api/admin/stats", {"headers": admin(i)})),
+        ("GET /api/admin/complaints/{complaint_id}/timeline", lambda i: (
+            "GET", f"/api/admin/complaints/{ctx.pick(ctx.assigned, i)['id']}/timeline", {"headers": admin(i)}
+        )),
+        ("GET /api/admin/workers/productivity", lambda i: (
+            "GET", "/api/admin/workers/productivity", {"headers": admin(i), "params": {"start": "2000-01-01"}}
+        )),
+        ("POST /api/admin/workers/productivity/rebuild", lambda i: (
+            "POST", "/api/admin/workers/productivity/rebuild", {"headers": admin(i)}
+        )),
+        ("GET /api/admin/diagnostics/query-plans", lambda i: (
+            "GET", "/api/admin/diagnostics/query-plans", {"headers": admin(i)}
+        )),
+        ("GET /api/admin/export/complaints", lambda i: (
+            "GET", "/api/admin/export/complaints", {"headers": admin(i), "params": {"format": "csv" if i % 2 else "ndjson"}}
+        )),
+        ("GET /api/admin/export/worker-logs", lambda i: (
+            "GET", "/api/admin/export/worker-logs", {"headers": admin(i), "params": {"format": "csv" if i % 2 else "ndjson"}}
+        )),
+        ("GET /api/worker/tasks", lambda i: (
+            "GET", "/api/worker/tasks", {"headers": ctx.headers(ctx.pick(ctx.workers, i))}
+        )),
+        ("PUT /api/worker/tasks/{complaint_id}/status", lambda i: (
+            "PUT", f"/api/worker/tasks/{ctx.pick(ctx.assigned, i)['id']}/status",
+            {"headers": worker_for(ctx.pick(ctx.assigned, i)), "data": {"status": "In Progress"}}
+        )),
+        ("POST /api/media", lambda i: ("POST", "/api/media", {
+            "headers": resident(i), "files": {"file": ("photo.png", ctx.png, "image/png")}
+        })),
+        ("GET /api/media/{media_id}", lambda i: ("GET", f"/api/media/{ctx.media_id}", {"headers": admin(i)})),
+        ("GET /api/media/{media_id}/thumbnail", lambda i: ("GET", f"/api/media/{ctx.media_id}/thumbnail", {"headers": admin(i)})),
+        ("GET /api/notifications", lambda i: (
+            "GET", "/api/notifications", {"headers": ctx.headers({"id": ctx.pick(ctx.notifications, i)["user_id"]})}
+        )),
+        ("GET /api/notifications/unread-count", lambda i: (
+            "GET", "/api/notifications/unread-count",
+            {"headers": ctx.headers({"id": ctx.pick(ctx.notifications, i)["user_id"]})}
+        )),
+        ("PUT /api/notifications/{notification_id}/read", lambda i: (
+            "PUT", f"/api/notifications/{ctx.pick(ctx.notifications, i)['id']}/read",
+            {"headers": ctx.headers({"id": ctx.pick(ctx.notifications, i)["user_id"]})}
+        )),
+        ("PUT /api/notifications/read-all", lambda i: (
+            "PUT", "/api/notifications/read-all",
+            {"headers": ctx.headers({"id": ctx.pick(ctx.notifications, i)["user_id"]})}
+        )),
+    ]
+
+
+def app_routes() -> set:
+    routes = set()
+    for route in server.app.routes:
+        if getattr(route, "path", "").startswith("/api"):
+            for method in sorted(getattr(route, "methods", None) or []):
+                if method != "HEAD":
+                    routes.add(f"{method} {route.path}")
+    return routes
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def wait_for_outbox():
+    while server.notification_outbox.stats()["pending"]:
+        await asyncio.sleep(0.01)
+
+
+async def run_scenario(client, build, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(i):
+        nonlocal errors
+        method, url, kwargs = build(i)
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            errors += 1
+
+    ops_before = command_counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    await wait_for_outbox()
+    ops = command_counter.count - ops_before
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "rps": round(requests / elapsed, 1),
+        "db_ops_per_request": round(ops / requests, 2),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for route, current in results.items():
+        previous = baseline.get(route)
+        if not previous:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(f"{route}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["db_ops_per_request"] > previous["db_ops_per_request"] * (1 + threshold) + 0.5:
+            regressions.append(
+                f"{route}: db ops/request {previous['db_ops_per_request']} -> {current['db_ops_per_request']}"
+            )
+    return regressions
+
+
+async def run(args) -> dict:
+    await server.client.drop_database(server.db.name)
+    ctx = Context()
+    await seed(args, ctx)
+
+    results = {}
+    transport = httpx.ASGITransport(app=server.app)
+    async with server.app.router.lifespan_context(server.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for route, build in scenarios(ctx):
+                if args.route and args.route not in route:
+                    continue
+                results[route] = await run_scenario(client, build, args.requests, args.concurrency)
+                print(f"{route:60} " + " ".join(f"{k}={v}" for k, v in results[route].items()))
+
+    uncovered = app_routes() - set(results) - set(SKIPPED_ROUTES)
+    if uncovered and not args.route:
+        print("Routes without a scenario: " + ", ".join(sorted(uncovered)))
+    await server.client.drop_database(server.db.name)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--admins", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=40)
+    parser.add_argument("--residents", type=int, default=1500)
+    parser.add_argument("--complaints", type=int, default=20000)
+    parser.add_argument("--logs", type=int, default=30000)
+    parser.add_argument("--notifications", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--route", help="only run routes containing this substring")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="fail on regressions against the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--db", required=True, help="scratch database to seed and drop")
+    args = parser.parse_args()
+    configured = dotenv_values(BENCHMARK_DIR.parent / ".env").get("DB_NAME")
+    if args.db == configured:
+        parser.error(f"--db {args.db} is the database configured in backend/.env")
+    if not args.db.endswith(SCRATCH_SUFFIXES):
+        parser.error(f"--db must end in one of {', '.join(SCRATCH_SUFFIXES)}")
+
+    # Overrides any DB_NAME from the environment; load_dotenv never replaces it
+    os.environ["DB_NAME"] = args.db
+    global server
+    import server
+
+    results = asyncio.run(run(args))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    if args.write_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+    if args.check:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}; run with --write-baseline first")
+            sys.exit(2)
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
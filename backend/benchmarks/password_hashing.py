@@ -0,0 +1,83 @@
+"""Event-loop latency while bcrypt runs for concurrent logins.
+
+Compares hashing inline on the event loop (the old behaviour) with the
+thread-pool helpers in server.py. A probe task wakes every 5ms and records
+how late it was scheduled; on a blocked loop the lag grows with every login.
+
+    python backend/benchmarks/password_hashing.py --logins 50 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+async def probe_lag(samples: list, stop: asyncio.Event, interval: float = 0.005):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - started - interval) * 1000)
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(mode: str, logins: int, password: str, hashed: str) -> dict:
+    import server
+
+    async def inline_login():
+        server.pwd_context.verify(password, hashed)
+        await asyncio.sleep(0)
+
+    async def pooled_login():
+        await server.verify_password(password, hashed)
+
+    login = inline_login if mode == "inline" else pooled_login
+    samples, stop = [], asyncio.Event()
+    probe = asyncio.create_task(probe_lag(samples, stop))
+    await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+    return {
+        "mode": mode,
+        "logins": logins,
+        "wall_seconds": round(elapsed, 3),
+        "lag_p50_ms": round(statistics.median(samples), 2),
+        "lag_p99_ms": round(percentile(samples, 0.99), 2),
+        "lag_max_ms": round(max(samples), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+
+    # server.py only needs these to import; no database connection is made
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("DB_NAME", "benchmark")
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    import server
+
+    password = "correct horse battery staple"
+    hashed = server.pwd_context.hash(password)
+    for mode in ("inline", "pooled"):
+        result = asyncio.run(run(mode, args.logins, password, hashed))
+        print(" ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
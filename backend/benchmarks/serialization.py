@@ -0,0 +1,114 @@
+"""Bytes and CPU per request for the complaint list and create paths.
+
+Compares the old response path (full documents through FastAPI's
+jsonable_encoder and stdlib json, as JSONResponse renders them) with the
+new one (LIST_DETAIL_FIELDS projected away, rendered by ORJSONResponse),
+and the old create path (one Complaint model_dump per use) with the new
+one (dumped once). Runs in-process on synthetic documents; no database is
+needed.
+
+    python backend/benchmarks/serialization.py --complaints 100 --requests 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def complaint_docs(server, count: int, rng: random.Random) -> list:
+    docs = []
+    for i in range(count):
+        doc = server.Complaint(
+            resident_id=f"resident-{i % 50}",
+            complaint_type=rng.choice(["common_area", "personal_room"]),
+            floor=str(rng.randint(1, 8)),
+            room=str(rng.randint(100, 899)),
+            category="Plumbing",
+            subcategory="Leaking tap",
+            description="Water leaking from the tap near the washroom " * rng.randint(2, 20),
+            status="Assigned",
+            assigned_to=f"worker-{i % 10}",
+            resolution="Replaced the washer and tightened the fitting " * rng.randint(0, 5) or None,
+            media_url=f"/api/media/{i:032x}",
+            media_thumbnail_url=f"/api/media/{i:032x}/thumbnail"
+        ).model_dump()
+        doc.update({"resident_name": f"Resident {i % 50}", "resident_email": f"resident{i % 50}@vnit.ac.in"})
+        docs.append(doc)
+    return docs
+
+
+def measure(render, requests: int) -> dict:
+    started_cpu = time.process_time()
+    started = time.perf_counter()
+    size = 0
+    for _ in range(requests):
+        size = len(render())
+    return {
+        "bytes": size,
+        "cpu_ms": round((time.process_time() - started_cpu) * 1000 / requests, 3),
+        "wall_ms": round((time.perf_counter() - started) * 1000 / requests, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--complaints", type=int, default=100, help="documents per list response")
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    # server.py only needs these to import; no database connection is made
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("DB_NAME", "benchmark")
+    import server
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse, ORJSONResponse
+
+    docs = complaint_docs(server, args.complaints, random.Random(42))
+    trimmed_fields = set(server.LIST_DETAIL_FIELDS) - {"description"}
+
+    def list_before():
+        return JSONResponse(content=jsonable_encoder(docs)).body
+
+    def list_after():
+        # What the dashboards request: description kept, the rest projected away
+        trimmed = [{k: v for k, v in doc.items() if k not in trimmed_fields} for doc in docs]
+        return ORJSONResponse(trimmed).body
+
+    def list_after_default():
+        trimmed = [{k: v for k, v in doc.items() if k not in server.LIST_DETAIL_FIELDS} for doc in docs]
+        return ORJSONResponse(trimmed).body
+
+    payload = server.ComplaintCreate(
+        complaint_type="common_area", floor="2", category="Plumbing", subcategory="Leaking tap",
+        description="Water leaking from the tap near the washroom"
+    )
+
+    def create_before():
+        complaint = server.Complaint(resident_id="resident-1", **payload.model_dump(exclude={"media_url"}))
+        for _ in range(4):
+            complaint.model_dump()
+        return JSONResponse(content=jsonable_encoder(complaint.model_dump())).body
+
+    def create_after():
+        complaint = server.Complaint(resident_id="resident-1", **payload.model_dump(exclude={"media_url"}))
+        return ORJSONResponse(complaint.model_dump()).body
+
+    # Projection trimming happens in Mongo on the real path; the dict
+    # comprehensions above slightly overstate the new path's CPU cost
+    for name, render in (
+        ("list_before", list_before),
+        ("list_after_fields_description", list_after),
+        ("list_after_default", list_after_default),
+        ("create_before", create_before),
+        ("create_after", create_after),
+    ):
+        result = measure(render, args.requests)
+        print(f"{name} " + " ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Convert ISO string timestamps to native BSON dates.
+
+Older documents stored created_at / updated_at / resolved_at as ISO 8601
+strings. This walks each collection in _id order, in batches, and rewrites
+any string timestamp as a date. Each update is guarded by the original
+string value, so the migration is idempotent and safe to re-run or to run
+while the API is serving traffic.
+
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=vnit \\
+        python backend/migrate_timestamps.py --dry-run
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+
+from pymongo import ASCENDING, UpdateOne
+
+import server
+
+TIMESTAMP_FIELDS = {
+    "users": ["created_at"],
+    "complaints": ["created_at", "updated_at", "resolved_at"],
+    "notifications": ["created_at"],
+    "worker_logs": ["created_at"],
+    "analytics": ["rebuilt_at"],
+}
+
+
+def parse_timestamp(value: str):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def migrate_collection(name: str, fields: list, batch_size: int, dry_run: bool) -> dict:
+    collection = server.db[name]
+    query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+    projection = {field: 1 for field in fields}
+    stats = {"scanned": 0, "converted": 0, "unparseable": 0}
+    last_id = None
+
+    while True:
+        batch_query = query if last_id is None else {"$and": [query, {"_id": {"$gt": last_id}}]}
+        docs = await collection.find(batch_query, projection).sort("_id", ASCENDING).limit(batch_size).to_list(batch_size)
+        if not docs:
+            break
+        last_id = docs[-1]['_id']
+        stats["scanned"] += len(docs)
+
+        operations = []
+        for doc in docs:
+            for field in fields:
+                value = doc.get(field)
+                if not isinstance(value, str):
+                    continue
+                parsed = parse_timestamp(value)
+                if parsed is None:
+                    stats["unparseable"] += 1
+                    continue
+                # Guarded by the old value so a concurrent write is never clobbered
+                operations.append(UpdateOne({"_id": doc['_id'], field: value}, {"$set": {field: parsed}}))
+
+        if dry_run:
+            stats["converted"] += len(operations)
+        elif operations:
+            result = await collection.bulk_write(operations, ordered=False)
+            stats["converted"] += result.modified_count
+
+    return stats
+
+
+async def run(batch_size: int, dry_run: bool):
+    for name, fields in TIMESTAMP_FIELDS.items():
+        stats = await migrate_collection(name, fields, batch_size, dry_run)
+        print(f"{name}: scanned={stats['scanned']} converted={stats['converted']} unparseable={stats['unparseable']}")
+    server.client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="count conversions without writing")
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be positive")
+    asyncio.run(run(args.batch_size, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
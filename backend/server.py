@@ -1,37 +1,460 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, Query, Request, Response
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.routing import Match
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import ASCENDING, DESCENDING, TEXT, CursorType, IndexModel, ReturnDocument, UpdateMany, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError, CollectionInvalid, DuplicateKeyError, OperationFailure, PyMongoError
+from gridfs.errors import NoFile
 import os
+import io
+import csv
+import json
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
 from typing import List, Optional
 import uuid
+import time
+import bisect
+import hashlib
+import heapq
+import threading
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
 import jwt
+import orjson
 import base64
+import binascii
+from io import BytesIO
+from PIL import Image
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# Metrics
+LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+class Histogram:
+    def __init__(self, buckets: List[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+class RequestMetrics:
+    # Per-route latency histograms, in-flight gauges and response counters
+    def __init__(self):
+        self.latency = defaultdict(Histogram)
+        self.in_flight = defaultdict(int)
+        self.responses = defaultdict(int)
+    
+    def started(self, key: tuple):
+        self.in_flight[key] += 1
+    
+    def finished(self, key: tuple, status_code: int, seconds: float):
+        self.in_flight[key] -= 1
+        self.latency[key].observe(seconds)
+        self.responses[key + (str(status_code),)] += 1
+
+def query_shape(value):
+    # Keep keys and operators, replace literal values, so slow-query logs group by shape
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [query_shape(item) for item in value[:3]]
+    return "?"
+
+class CommandMetrics(monitoring.CommandListener):
+    # pymongo command listener; callbacks may run on driver threads
+    def __init__(self, slow_ms: float):
+        self.slow_ms = slow_ms
+        self.latency = defaultdict(Histogram)
+        self.failures = defaultdict(int)
+        self.slow = defaultdict(int)
+        self._pending = {}
+        self._lock = threading.Lock()
+    
+    def started(self, event):
+        command = event.command
+        collection = command.get("collection") if event.command_name == "getMore" else command.get(event.command_name)
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (
+                collection if isinstance(collection, str) else "",
+                command
+            )
+    
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+    
+    def failed(self, event):
+        self._finish(event, failed=True)
+    
+    def _finish(self, event, failed: bool):
+        with self._lock:
+            collection, command = self._pending.pop((event.connection_id, event.request_id), ("", {}))
+            key = (collection, event.command_name)
+            seconds = event.duration_micros / 1e6
+            self.latency[key].observe(seconds)
+            if failed:
+                self.failures[key] += 1
+            is_slow = seconds * 1000 >= self.slow_ms
+            if is_slow:
+                self.slow[key] += 1
+        if is_slow:
+            shape = command.get("filter", command.get("query", command.get("pipeline", command.get("updates"))))
+            logger.warning(
+                "Slow query %s.%s took %.1fms shape=%s",
+                collection, event.command_name, seconds * 1000, json.dumps(query_shape(shape), default=str)
+            )
+
+request_metrics = RequestMetrics()
+command_metrics = CommandMetrics(SLOW_QUERY_MS)
+
+# MongoDB connection. Pool settings are per process; with several uvicorn
+# workers the server sees workers * MONGO_MAX_POOL_SIZE connections at most.
+# Motor connects lazily, so the pool is opened and warmed by the lifespan.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 100))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 0))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', 300000))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', 10000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 10000))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', 10000))
+# tz_aware so stored dates come back as UTC-aware datetimes
+client = AsyncIOMotorClient(
+    mongo_url,
+    tz_aware=True,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+    connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    event_listeners=[command_metrics]
+)
 db = client[os.environ['DB_NAME']]
+media_bucket = AsyncIOMotorGridFSBucket(db, bucket_name="media")
 
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes whose cost differs from BCRYPT_ROUNDS are upgraded on the next login
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 4))
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+# bcrypt is CPU bound; run it off the event loop in a bounded pool
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production')
 JWT_ALGORITHM = "HS256"
+# Tokens that travel in URLs (?token=) end up in access logs and browser
+# history, so they are scoped and expire within a minute
+QUERY_TOKEN_SECONDS = int(os.environ.get('QUERY_TOKEN_SECONDS', 60))
+QUERY_TOKEN_SCOPE = "query"
+
+# Cross-process invalidation bus
+INVALIDATION_BUS_ENABLED = os.environ.get('INVALIDATION_BUS_ENABLED', 'true').lower() == 'true'
+INVALIDATION_BUS_BYTES = int(os.environ.get('INVALIDATION_BUS_BYTES', 16 * 1024 * 1024))
+INVALIDATION_POLL_SECONDS = float(os.environ.get('INVALIDATION_POLL_SECONDS', 1))
+READINESS_TIMEOUT_SECONDS = float(os.environ.get('READINESS_TIMEOUT_SECONDS', 2))
+INDEX_RETRY_SECONDS = float(os.environ.get('INDEX_RETRY_SECONDS', 60))
+
+# Authenticated user cache
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 10000))
+USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', 60))
+
+# Notification outbox
+OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 500))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 5))
+ADMIN_IDS_TTL = float(os.environ.get('ADMIN_IDS_TTL', 60))
+
+# Notification streaming
+NOTIFICATION_HEARTBEAT_SECONDS = float(os.environ.get('NOTIFICATION_HEARTBEAT_SECONDS', 15))
+NOTIFICATION_REPLAY_LIMIT = int(os.environ.get('NOTIFICATION_REPLAY_LIMIT', 100))
+# Read notifications are removed by a TTL index this long after being read
+NOTIFICATION_READ_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_READ_RETENTION_DAYS', 30))
+
+# Media storage
+MEDIA_CHUNK_SIZE = 256 * 1024
+MAX_MEDIA_BYTES = int(os.environ.get('MAX_MEDIA_BYTES', 20 * 1024 * 1024))
+MEDIA_THUMBNAIL_SIZE = (320, 320)
+MEDIA_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# Scriptable formats that a browser would render as a document on our origin
+BLOCKED_MEDIA_TYPES = {"image/svg+xml"}
+
+# Exports
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_BYTES = 64 * 1024
+COMPLAINT_EXPORT_COLUMNS = [
+    "id", "created_at", "updated_at", "resolved_at", "status", "priority", "complaint_type", "floor", "room",
+    "category", "subcategory", "description", "resident_id", "assigned_to", "representative_id", "count",
+    "rejection_reason", "resolution", "media_url"
+]
+WORKER_LOG_EXPORT_COLUMNS = ["id", "created_at", "worker_id", "complaint_id", "action", "actor_id", "actor_role", "proof_media"]
+
+# Pagination
+DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', 100))
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 500))
+# Bulky complaint fields left out of list views unless requested with ?fields=
+LIST_DETAIL_FIELDS = ["description", "resolution", "media_url"]
+
+# Complaint search
+SEARCH_FACETS = ["status", "priority", "floor", "category", "assigned_to"]
+
+# Complaint lifecycle
+CLOSED_STATUSES = ["Completed", "Rejected"]
+DEDUP_MAX_ATTEMPTS = 5
+# Statuses in which a task counts towards its worker's open workload
+OPEN_TASK_STATUSES = ["Assigned", "In Progress", "RequestedChanges"]
+CATEGORY_SPECIALIZATIONS = {
+    "Electrical": "electrician",
+    "Plumbing": "plumber",
+    "Cleaning": "cleaner",
+    "Carpentry": "carpenter"
+}
+MAX_BULK_ASSIGN = int(os.environ.get('MAX_BULK_ASSIGN', 500))
+ASSIGNMENT_RELOAD_SECONDS = float(os.environ.get('ASSIGNMENT_RELOAD_SECONDS', 60))
+
+PRIORITY_LEVELS = ["Low", "Medium", "High", "Urgent"]
+
+# Duplicate count -> priority, evaluated server-side inside the increment.
+# Never lowers a priority, so SLA escalations survive later duplicates.
+PRIORITY_BY_COUNT = {"$arrayElemAt": [PRIORITY_LEVELS, {"$max": [
+    {"$indexOfArray": [PRIORITY_LEVELS, "$priority"]},
+    {"$switch": {
+        "branches": [
+            {"case": {"$lt": ["$count", 3]}, "then": 0},
+            {"case": {"$lte": ["$count", 5]}, "then": 1}
+        ],
+        "default": 2
+    }}
+]}]}
+
+# SLA escalation: a complaint still open after a multiple of its category's
+# SLA is raised to the matching priority
+SLA_SCAN_INTERVAL_SECONDS = float(os.environ.get('SLA_SCAN_INTERVAL_SECONDS', 300))
+SLA_BATCH_SIZE = int(os.environ.get('SLA_BATCH_SIZE', 500))
+SLA_STATUSES = ["Pending", *OPEN_TASK_STATUSES, "Completed - Awaiting Admin Review"]
+DEFAULT_SLA_HOURS = 72
+CATEGORY_SLA_HOURS = {
+    "Electrical": 24,
+    "Plumbing": 24,
+    "Cleaning": 12,
+    "Carpentry": 72
+}
+SLA_ESCALATION_STEPS = [(1, "Medium"), (2, "High"), (4, "Urgent")]
+
+# Worker productivity: per worker-day rollups in worker_daily_stats. Admin
+# decisions are logged to worker_logs against the assignee with actor_role
+# "admin"; ADMIN_LOG_ACTIONS identifies them in logs written before that.
+WORKER_ROLLUPS_ID = "worker_rollups"
+WORKER_LOG_ACTORS_ID = "worker_log_actors"
+ADMIN_LOG_ACTIONS = ["Assigned", "Completed", "RequestedChanges"]
+PRODUCTIVITY_DEFAULT_DAYS = 30
+
+# Analytics summary: resolution-time histogram lower bounds, in hours
+ANALYTICS_SUMMARY_ID = "complaints"
+RESOLUTION_BUCKET_HOURS = [0, 1, 2, 4, 8, 12, 24, 48, 72, 120, 168, 336, 720]
+
+# Indexes backing every hot query; ensured at startup
+INDEXES = {
+    "users": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        IndexModel([("role", ASCENDING), ("is_active", ASCENDING)], name="role_active"),
+        IndexModel([("role", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="role_page"),
+    ],
+    "complaints": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel(
+            [("representative_id", ASCENDING), ("status", ASCENDING), ("created_at", ASCENDING)],
+            name="representative_status_created",
+        ),
+        IndexModel(
+            [("representative_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="representative_page",
+        ),
+        IndexModel(
+            [("assigned_to", ASCENDING), ("representative_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="assigned_page",
+        ),
+        IndexModel([("resident_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="resident_page"),
+        IndexModel([("created_at", ASCENDING)], name="created"),
+        IndexModel(
+            [("resident_id", ASCENDING), ("complaint_type", ASCENDING), ("category", ASCENDING), ("created_at", DESCENDING)],
+            name="resident_duplicate_check",
+        ),
+        # One open common-area representative per (floor, category, subcategory);
+        # dedup_key is only set on open representatives
+        IndexModel(
+            [("dedup_key", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"dedup_key": {"$type": "string"}},
+            name="open_representative_unique",
+        ),
+        IndexModel(
+            [
+                ("complaint_type", ASCENDING),
+                ("category", ASCENDING),
+                ("subcategory", ASCENDING),
+                ("floor", ASCENDING),
+                ("representative_id", ASCENDING),
+                ("status", ASCENDING),
+            ],
+            name="common_area_dedup",
+        ),
+        IndexModel(
+            [("description", TEXT), ("category", TEXT), ("subcategory", TEXT)],
+            weights={"category": 5, "subcategory": 3, "description": 1},
+            name="complaint_text",
+        ),
+    ],
+    "worker_logs": [
+        IndexModel([("worker_id", ASCENDING), ("created_at", ASCENDING)], name="worker_created"),
+        IndexModel([("created_at", ASCENDING)], name="created"),
+        IndexModel([("complaint_id", ASCENDING), ("created_at", ASCENDING)], name="complaint_created"),
+    ],
+    "worker_daily_stats": [
+        IndexModel([("worker_id", ASCENDING), ("day", ASCENDING)], name="worker_day"),
+        IndexModel([("day", ASCENDING)], name="day"),
+    ],
+    "notifications": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created"),
+        IndexModel([("user_id", ASCENDING), ("is_read", ASCENDING)], name="user_unread"),
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel(
+            [("read_at", ASCENDING)],
+            expireAfterSeconds=NOTIFICATION_READ_RETENTION_DAYS * 86400,
+            name="read_ttl"
+        ),
+    ],
+}
+
+# Representative queries checked by the query plan diagnostics: (name, collection, filter, sort)
+HOT_QUERIES = [
+    ("current_user", "users", {"id": "00000000-0000-0000-0000-000000000000"}, None),
+    ("login_by_email", "users", {"email": "user@example.com"}, None),
+    ("admins", "users", {"role": "admin"}, None),
+    ("workers", "users", {"role": "worker"}, [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("complaint_by_id", "complaints", {"id": "00000000-0000-0000-0000-000000000000"}, None),
+    ("pending_complaints", "complaints", {"representative_id": None, "status": "Pending"}, [("created_at", ASCENDING)]),
+    ("admin_complaints", "complaints", {"representative_id": None}, [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("resident_complaints", "complaints", {"resident_id": "00000000-0000-0000-0000-000000000000"}, [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("worker_tasks", "complaints", {"assigned_to": "00000000-0000-0000-0000-000000000000", "representative_id": None}, [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("personal_duplicate_check", "complaints", {
+        "resident_id": "00000000-0000-0000-0000-000000000000",
+        "complaint_type": "personal_room",
+        "category": "Electrical",
+        "created_at": {"$gte": datetime(1970, 1, 1, tzinfo=timezone.utc)},
+        "status": {"$nin": ["Completed", "Rejected"]}
+    }, None),
+    ("common_area_dedup", "complaints", {"dedup_key": "1|Electrical|Light not working"}, None),
+    ("complaint_timeline", "worker_logs", {"complaint_id": "00000000-0000-0000-0000-000000000000"}, [("created_at", ASCENDING)]),
+    ("worker_productivity", "worker_daily_stats", {"day": {"$gte": "2024-01-01", "$lte": "2024-01-31"}}, None),
+    ("complaint_search", "complaints", {"$text": {"$search": "leak"}, "representative_id": None}, None),
+    ("notifications", "notifications", {"user_id": "00000000-0000-0000-0000-000000000000"}, [("created_at", DESCENDING)]),
+    ("unread_notifications", "notifications", {"user_id": "00000000-0000-0000-0000-000000000000", "is_read": False}, None),
+]
+
+async def sync_ttl_indexes(collection_name: str, indexes: List[IndexModel]):
+    # createIndexes refuses to change expireAfterSeconds on an existing index
+    for index in indexes:
+        spec = index.document
+        if "expireAfterSeconds" not in spec:
+            continue
+        try:
+            await db.command(
+                "collMod", collection_name,
+                index={"name": spec["name"], "expireAfterSeconds": spec["expireAfterSeconds"]}
+            )
+        except OperationFailure as exc:
+            if exc.code != 27:  # IndexNotFound: created by the retry below
+                raise
+
+async def ensure_indexes() -> bool:
+    ok = True
+    for collection_name, indexes in INDEXES.items():
+        try:
+            try:
+                await db[collection_name].create_indexes(indexes)
+            except OperationFailure as exc:
+                if exc.code != 85:  # IndexOptionsConflict
+                    raise
+                await sync_ttl_indexes(collection_name, indexes)
+                await db[collection_name].create_indexes(indexes)
+        except Exception:
+            ok = False
+            logger.exception("Failed to ensure indexes on %s", collection_name)
+    return ok
+
+def find_plan_stages(plan: dict) -> List[str]:
+    # Flatten the stage names of a (possibly nested) winning plan
+    stages = [plan.get("stage")] if plan.get("stage") else []
+    if plan.get("queryPlan"):
+        stages.extend(find_plan_stages(plan["queryPlan"]))
+    if plan.get("inputStage"):
+        stages.extend(find_plan_stages(plan["inputStage"]))
+    for child in plan.get("inputStages", []):
+        stages.extend(find_plan_stages(child))
+    return stages
+
+async def explain_hot_queries() -> List[dict]:
+    report = []
+    for name, collection_name, query, sort in HOT_QUERIES:
+        cursor = db[collection_name].find(query, {"_id": 0})
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.limit(1).explain()
+        query_planner = explanation.get("queryPlanner", {})
+        stages = find_plan_stages(query_planner.get("winningPlan", {}))
+        report.append({
+            "name": name,
+            "collection": collection_name,
+            "stages": stages,
+            "collection_scan": "COLLSCAN" in stages,
+            "in_memory_sort": "SORT" in stages,
+        })
+    return report
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await startup_db_client()
+    try:
+        yield
+    finally:
+        await shutdown_db_client()
 
 # Create the main app
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 api_router = APIRouter(prefix="/api")
 
+def utc_now() -> datetime:
+    # BSON dates keep milliseconds; truncating here means a value we write
+    # compares equal to the one read back
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
 # Models
 class UserBase(BaseModel):
     email: EmailStr
@@ -54,7 +477,7 @@ class User(BaseModel):
     room: Optional[str] = None
     specialization: Optional[str] = None
     is_active: bool = True
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: datetime = Field(default_factory=utc_now)
 
 class LoginRequest(BaseModel):
     email: EmailStr
@@ -69,6 +492,20 @@ class ComplaintCreate(BaseModel):
     description: Optional[str] = None
     media_url: Optional[str] = None
 
+class BulkApproveItem(BaseModel):
+    complaint_id: str
+    worker_id: str
+
+class BulkApproveRequest(BaseModel):
+    items: List[BulkApproveItem] = Field(..., min_length=1, max_length=MAX_BULK_ASSIGN)
+
+class BulkRejectItem(BaseModel):
+    complaint_id: str
+    rejection_reason: str = Field(..., min_length=1)
+
+class BulkRejectRequest(BaseModel):
+    items: List[BulkRejectItem] = Field(..., min_length=1, max_length=MAX_BULK_ASSIGN)
+
 class Complaint(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -87,9 +524,11 @@ class Complaint(BaseModel):
     rejection_reason: Optional[str] = None
     resolution: Optional[str] = None
     media_url: Optional[str] = None
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    resolved_at: Optional[str] = None
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
+    assigned_at: Optional[datetime] = None
+    resolved_at: Optional[datetime] = None
+    media_thumbnail_url: Optional[str] = None
 
 class NotificationModel(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -99,7 +538,8 @@ class NotificationModel(BaseModel):
     title: str
     message: str
     is_read: bool = False
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    read_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=utc_now)
 
 class WorkerLog(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -107,15 +547,385 @@ class WorkerLog(BaseModel):
     worker_id: str
     complaint_id: str
     action: str
+    actor_id: Optional[str] = None
+    actor_role: str = "worker"
     proof_media: Optional[str] = None
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: datetime = Field(default_factory=utc_now)
 
 # Helper functions
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+class TTLCache:
+    # Bounded LRU cache whose entries also expire after `ttl` seconds
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key, value):
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0
+        }
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+class InvalidationBus:
+    # Fans in-process state changes (cache invalidations, notification
+    # publishes, workload deltas) out to the other worker processes through a
+    # capped collection. Publishing is fire-and-forget: events are queued and
+    # written in batches by a background task. Other processes receive them
+    # from a change stream, or by tailing the capped collection on a
+    # standalone mongod where change streams are unavailable. Each process
+    # applies its own changes locally and ignores its own events.
+    def __init__(self, collection_name: str, size_bytes: int, enabled: bool = True):
+        self.collection_name = collection_name
+        self.size_bytes = size_bytes
+        self.enabled = enabled
+        self.origin = uuid.uuid4().hex
+        self.mode = None
+        self._handlers = {}
+        self._pending = []
+        self._wakeup = asyncio.Event()
+        self._tasks = []
+        self._seen = deque(maxlen=10000)
+        self._seen_ids = set()
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+    
+    @property
+    def collection(self):
+        return db[self.collection_name]
+    
+    def on(self, kind: str, handler):
+        self._handlers[kind] = handler
+    
+    def publish(self, kind: str, payload: dict):
+        # Nothing is listening before start(), e.g. in scripts using server.py
+        if not self._tasks:
+            return
+        self._pending.append({"origin": self.origin, "kind": kind, "payload": payload, "created_at": utc_now()})
+        self._wakeup.set()
+    
+    async def start(self):
+        if not self.enabled or self._tasks:
+            return
+        try:
+            await db.create_collection(self.collection_name, capped=True, size=self.size_bytes)
+        except CollectionInvalid:
+            pass
+        except OperationFailure as exc:
+            if exc.code != 48:  # NamespaceExists: another process created it first
+                raise
+        self._tasks = [asyncio.create_task(self._write()), asyncio.create_task(self._listen())]
+    
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self._flush()
+    
+    async def _flush(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+            self.published += len(batch)
+        except PyMongoError:
+            # Best effort: cache TTLs bound how stale other processes can get
+            self.dropped += len(batch)
+            logger.exception("Failed to publish %d invalidation events", len(batch))
+    
+    async def _write(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self._flush()
+    
+    async def _listen(self):
+        resume_token = None
+        while True:
+            try:
+                async with self.collection.watch(
+                    [{"$match": {"operationType": "insert", "fullDocument.origin": {"$ne": self.origin}}}],
+                    resume_after=resume_token
+                ) as stream:
+                    self.mode = "change_stream"
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        self._deliver(change['fullDocument'])
+            except OperationFailure as exc:
+                # 40573: change streams need a replica set
+                if exc.code in (40573, 40324) or "replica set" in str(exc):
+                    return await self._tail()
+                logger.exception("Invalidation change stream failed")
+            except PyMongoError:
+                logger.exception("Invalidation change stream failed")
+            await asyncio.sleep(INVALIDATION_POLL_SECONDS)
+    
+    async def _tail(self):
+        # Capped collections keep insertion order, so a tailable cursor sees
+        # events in the order they were written. Reopened cursors overlap the
+        # last position slightly; delivered ids are remembered to skip repeats.
+        self.mode = "tailing"
+        since = utc_now()
+        while True:
+            cursor = self.collection.find(
+                {"created_at": {"$gte": since - timedelta(seconds=2)}, "origin": {"$ne": self.origin}},
+                cursor_type=CursorType.TAILABLE_AWAIT
+            )
+            try:
+                while cursor.alive:
+                    async for event in cursor:
+                        since = max(since, event['created_at'])
+                        self._deliver(event)
+                    await asyncio.sleep(INVALIDATION_POLL_SECONDS)
+            except PyMongoError:
+                logger.exception("Tailing invalidation events failed")
+            await asyncio.sleep(INVALIDATION_POLL_SECONDS)
+    
+    def _deliver(self, event: dict):
+        if event.get('origin') == self.origin or event['_id'] in self._seen_ids:
+            return
+        if len(self._seen) == self._seen.maxlen:
+            self._seen_ids.discard(self._seen[0])
+        self._seen.append(event['_id'])
+        self._seen_ids.add(event['_id'])
+        self.received += 1
+        handler = self._handlers.get(event.get('kind'))
+        if handler is None:
+            return
+        try:
+            handler(event.get('payload') or {})
+        except Exception:
+            logger.exception("Invalidation handler for %s failed", event.get('kind'))
+    
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "pending": len(self._pending),
+            "published": self.published,
+            "received": self.received,
+            "dropped": self.dropped
+        }
+
+invalidation_bus = InvalidationBus("invalidations", INVALIDATION_BUS_BYTES, INVALIDATION_BUS_ENABLED)
+
+user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+def invalidate_cached_user(user_id: str):
+    # Call whenever a user document is modified
+    user_cache.invalidate(user_id)
+    invalidation_bus.publish("user", {"user_id": user_id})
+
+admin_ids_cache = TTLCache(1, ADMIN_IDS_TTL)
+
+def invalidate_admin_ids():
+    admin_ids_cache.clear()
+    invalidation_bus.publish("admins", {})
+
+async def get_admin_ids() -> List[str]:
+    admin_ids = admin_ids_cache.get("admins")
+    if admin_ids is None:
+        admins = await db.users.find({"role": "admin"}, {"_id": 0, "id": 1}).to_list(None)
+        admin_ids = [admin['id'] for admin in admins]
+        admin_ids_cache.set("admins", admin_ids)
+    return admin_ids
+
+class NotificationHub:
+    # In-process pub/sub: one bounded queue per open notification stream
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers = {}
+    
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+    
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+    
+    def publish(self, notification: dict):
+        for queue in self._subscribers.get(notification['user_id'], ()):
+            if queue.full():
+                # Slow consumer: drop the oldest event, it can resume from Last-Event-ID
+                queue.get_nowait()
+            queue.put_nowait(notification)
+    
+    def stats(self) -> dict:
+        return {
+            "users": len(self._subscribers),
+            "streams": sum(len(queues) for queues in self._subscribers.values())
+        }
+
+notification_hub = NotificationHub()
+
+class NotificationOutbox:
+    # In-process outbox: handlers enqueue notification documents and return
+    # immediately; a background task writes them in batches with insert_many.
+    def __init__(self, batch_size: int, max_attempts: int):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self._pending = deque()  # (enqueued_at, attempts, document)
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.dispatched = 0
+        self.retried = 0
+        self.dropped = 0
+        self.last_dispatch_lag = 0.0
+    
+    def enqueue(self, notifications: List[dict]):
+        enqueued_at = time.monotonic()
+        self._pending.extend((enqueued_at, 0, notification) for notification in notifications)
+        self._wakeup.set()
+    
+    def lag(self) -> float:
+        # Age of the oldest notification still waiting to be written
+        return time.monotonic() - self._pending[0][0] if self._pending else 0.0
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+    
+    async def flush(self):
+        while self._pending:
+            await self._dispatch(self._take_batch())
+    
+    def _take_batch(self) -> list:
+        return [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+    
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                await self._dispatch(self._take_batch())
+    
+    async def _dispatch(self, batch: list):
+        failed_indexes = set()
+        try:
+            await db.notifications.insert_many([entry[2] for entry in batch], ordered=False)
+        except BulkWriteError as exc:
+            # Duplicate keys mean an earlier attempt already wrote the document
+            failed_indexes = {
+                error['index'] for error in exc.details.get('writeErrors', []) if error.get('code') != 11000
+            }
+        except PyMongoError:
+            logger.exception("Failed to write %d notifications", len(batch))
+            failed_indexes = set(range(len(batch)))
+        
+        failed, published = [], []
+        for index, entry in enumerate(batch):
+            if index in failed_indexes:
+                failed.append(entry)
+            else:
+                notification = {k: v for k, v in entry[2].items() if k != "_id"}
+                notification_hub.publish(notification)
+                published.append(notification)
+        if published:
+            # Streams connected to other worker processes
+            invalidation_bus.publish("notifications", {"notifications": published})
+        self.dispatched += len(batch) - len(failed)
+        self.last_dispatch_lag = time.monotonic() - batch[0][0]
+        written = Counter(entry[2]['user_id'] for index, entry in enumerate(batch) if index not in failed_indexes)
+        try:
+            await adjust_unread_counters(written)
+            await bump_versions(f"notifications:{user_id}" for user_id in written)
+        except PyMongoError:
+            logger.exception("Failed to update notification counters")
+        if not failed:
+            return
+        
+        retry = [(enqueued_at, attempts + 1, doc) for enqueued_at, attempts, doc in failed if attempts + 1 < self.max_attempts]
+        self.dropped += len(failed) - len(retry)
+        if len(failed) > len(retry):
+            logger.error("Dropped %d notifications after %d attempts", len(failed) - len(retry), self.max_attempts)
+        if retry:
+            self.retried += len(retry)
+            await asyncio.sleep(min(0.1 * 2 ** retry[0][1], 5))
+            self._pending.extendleft(reversed(retry))
+    
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "lag_seconds": round(self.lag(), 3),
+            "last_dispatch_lag_seconds": round(self.last_dispatch_lag, 3),
+            "dispatched": self.dispatched,
+            "retried": self.retried,
+            "dropped": self.dropped
+        }
+
+notification_outbox = NotificationOutbox(OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS)
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.verify, plain_password, hashed_password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str):
+    # Returns (valid, new_hash); new_hash is set when the stored hash needs an upgrade
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
@@ -124,42 +934,1150 @@ def create_access_token(data: dict) -> str:
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
+def create_query_token(user_id: str) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(seconds=QUERY_TOKEN_SECONDS)
+    return jwt.encode({"sub": user_id, "scope": QUERY_TOKEN_SCOPE, "exp": expire}, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return await authenticate_token(credentials.credentials)
+
+async def get_stream_user(
+    token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    # EventSource cannot send headers, so streams may pass a short-lived
+    # query token from /auth/query-token as ?token=; session tokens are refused there
+    if credentials:
+        return await authenticate_token(credentials.credentials)
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return await authenticate_token(token, QUERY_TOKEN_SCOPE)
+
+async def authenticate_token(token: str, scope: Optional[str] = None) -> dict:
+    # Session tokens carry no scope; a scoped token is only accepted where asked for
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         user_id = payload.get("sub")
-        if user_id is None:
+        if user_id is None or payload.get("scope") != scope:
             raise HTTPException(status_code=401, detail="Invalid token")
-        user = await db.users.find_one({"id": user_id}, {"_id": 0})
+        user = user_cache.get(user_id)
         if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
+            user = await db.users.find_one({"id": user_id}, {"_id": 0, "password_hash": 0})
+            if user is None:
+                raise HTTPException(status_code=401, detail="User not found")
+            user_cache.set(user_id, user)
+        # Handlers may mutate the user they receive; keep the cached entry intact
+        return dict(user)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
 async def create_notification(user_id: str, complaint_id: str, title: str, message: str):
-    notification = NotificationModel(
-        user_id=user_id,
-        complaint_id=complaint_id,
-        title=title,
-        message=message
+    await notify_users([user_id], complaint_id, title, message)
+
+async def notify_users(user_ids: List[str], complaint_id: str, title: str, message: str):
+    # Queue one notification per user; the outbox writes them with a single insert_many
+    await notify_many([(user_id, complaint_id, title, message) for user_id in user_ids])
+
+async def notify_many(notifications: List[tuple]):
+    # notifications: (user_id, complaint_id, title, message) tuples. Documents
+    # have NotificationModel's shape but are built directly, since this runs
+    # once per recipient and the inputs need no validation.
+    now = utc_now()
+    notification_outbox.enqueue([
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "complaint_id": complaint_id,
+            "title": title,
+            "message": message,
+            "is_read": False,
+            "read_at": None,
+            "created_at": now
+        }
+        for user_id, complaint_id, title, message in notifications
+    ])
+
+async def adjust_unread_counters(deltas: dict):
+    # Per-user unread counters so the badge never counts the notifications collection
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if deltas:
+        await db.notification_counters.bulk_write([
+            UpdateOne({"_id": user_id}, {"$inc": {"unread": delta}}, upsert=True)
+            for user_id, delta in deltas.items()
+        ], ordered=False)
+
+async def rebuild_unread_counters():
+    # Recount from the notifications themselves; the counters are derived data
+    await db.notifications.aggregate([
+        {"$match": {"is_read": False}},
+        {"$group": {"_id": "$user_id", "unread": {"$sum": 1}}},
+        {"$merge": {"into": "notification_counters", "whenMatched": "replace", "whenNotMatched": "insert"}}
+    ]).to_list(None)
+    
+    counted = await db.notifications.distinct("user_id", {"is_read": False})
+    await db.notification_counters.update_many({"_id": {"$nin": counted}}, {"$set": {"unread": 0}})
+
+async def backfill_notification_retention():
+    # Notifications read before read_at existed would never expire otherwise
+    await db.notifications.update_many(
+        {"is_read": True, "read_at": None},
+        {"$set": {"read_at": utc_now()}}
     )
-    await db.notifications.insert_one(notification.model_dump())
+    if not await db.notification_counters.estimated_document_count():
+        await rebuild_unread_counters()
 
-async def update_priority(complaint_id: str, count: int):
-    if count < 3:
-        priority = "Low"
-    elif count <= 5:
-        priority = "Medium"
-    else:
-        priority = "High"
-    await db.complaints.update_one(
+async def backfill_log_actors():
+    # Logs written before actor_role existed: admin actions have no known actor.
+    # Runs once; the marker keeps later starts from rescanning worker_logs.
+    if await db.analytics.find_one({"_id": WORKER_LOG_ACTORS_ID}):
+        return
+    await db.worker_logs.update_many(
+        {"actor_role": None, "action": {"$in": ADMIN_LOG_ACTIONS}},
+        {"$set": {"actor_role": "admin", "actor_id": None}}
+    )
+    await db.worker_logs.update_many(
+        {"actor_role": None},
+        [{"$set": {"actor_role": "worker", "actor_id": "$worker_id"}}]
+    )
+    await db.analytics.replace_one({"_id": WORKER_LOG_ACTORS_ID}, {"backfilled_at": utc_now()}, upsert=True)
+
+async def bump_versions(scopes):
+    # Per-scope change counters backing the ETags of polled list endpoints
+    scopes = sorted({scope for scope in scopes if scope})
+    if scopes:
+        await db.change_versions.bulk_write([
+            UpdateOne({"_id": scope}, {"$inc": {"version": 1}}, upsert=True) for scope in scopes
+        ], ordered=False)
+
+def complaint_scopes(*complaints: dict, worker_id: Optional[str] = None) -> set:
+    # Every list view a complaint appears in: admin, its resident, its worker
+    scopes = {"complaints:admin"}
+    for complaint in complaints:
+        scopes.add(f"complaints:resident:{complaint['resident_id']}")
+        if complaint.get('assigned_to'):
+            scopes.add(f"complaints:worker:{complaint['assigned_to']}")
+    if worker_id:
+        scopes.add(f"complaints:worker:{worker_id}")
+    return scopes
+
+async def check_not_modified(request: Request, response: Response, scope: str) -> Optional[Response]:
+    # Answer If-None-Match with 304 using only the scope's change counter. The
+    # version is read before the data, so a concurrent write can only make the
+    # ETag older than the body, never newer.
+    doc = await db.change_versions.find_one({"_id": scope})
+    version = doc['version'] if doc else 0
+    digest = hashlib.sha1(f"{scope}:{version}:{request.url.query}".encode()).hexdigest()[:20]
+    etag = f'W/"{digest}"'
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    return None
+
+class AssignmentEngine:
+    # Active workers with their open task counts. Each specialization (and "*"
+    # for everyone) keeps a min-heap of (open_tasks, worker_id); stale entries
+    # are skipped lazily, so finding the least-loaded worker is O(log n).
+    # Counts shared over the bus are absolute, and every process reloads from
+    # Mongo periodically, so a dropped or replayed event cannot drift for long.
+    def __init__(self):
+        self.workers = {}  # worker_id -> {"specialization", "open_tasks"}
+        self._heaps = defaultdict(list)
+        self.loaded = False
+    
+    async def load(self):
+        workers = await db.users.find(
+            {"role": "worker", "is_active": True},
+            {"_id": 0, "id": 1, "specialization": 1}
+        ).to_list(None)
+        counts = await db.complaints.aggregate([
+            {"$match": {"status": {"$in": OPEN_TASK_STATUSES}, "representative_id": None, "assigned_to": {"$ne": None}}},
+            {"$group": {"_id": "$assigned_to", "open_tasks": {"$sum": 1}}}
+        ]).to_list(None)
+        open_tasks = {row['_id']: row['open_tasks'] for row in counts}
+        
+        self.workers = {}
+        self._heaps = defaultdict(list)
+        for worker in workers:
+            self.add_worker(worker['id'], worker.get('specialization'), open_tasks.get(worker['id'], 0))
+        self.loaded = True
+    
+    async def ensure_loaded(self):
+        if not self.loaded:
+            await self.load()
+    
+    def add_worker(self, worker_id: str, specialization: Optional[str], open_tasks: int = 0):
+        self.workers[worker_id] = {"specialization": specialization, "open_tasks": open_tasks}
+        self._push(worker_id)
+    
+    def open_tasks(self, worker_id: str) -> Optional[int]:
+        worker = self.workers.get(worker_id)
+        return worker['open_tasks'] if worker else None
+    
+    def _push(self, worker_id: str):
+        worker = self.workers[worker_id]
+        entry = (worker['open_tasks'], worker_id)
+        for key in ("*", worker['specialization']):
+            if key:
+                heap = self._heaps[key]
+                heapq.heappush(heap, entry)
+                if len(heap) > 4 * len(self.workers) + 64:
+                    self._compact(key)
+    
+    def _compact(self, key: str):
+        self._heaps[key] = [
+            (worker['open_tasks'], worker_id) for worker_id, worker in self.workers.items()
+            if key == "*" or worker['specialization'] == key
+        ]
+        heapq.heapify(self._heaps[key])
+    
+    def adjust(self, worker_id: Optional[str], delta: int):
+        worker = self.workers.get(worker_id)
+        if worker is None or not delta:
+            return
+        self.set_open_tasks(worker_id, worker['open_tasks'] + delta)
+        invalidation_bus.publish("workload", {"worker_id": worker_id, "open_tasks": worker['open_tasks']})
+    
+    def set_open_tasks(self, worker_id: str, open_tasks: int):
+        worker = self.workers.get(worker_id)
+        if worker is None or worker['open_tasks'] == max(open_tasks, 0):
+            return
+        worker['open_tasks'] = max(open_tasks, 0)
+        self._push(worker_id)
+    
+    def on_transition(self, old_worker: Optional[str], old_status: Optional[str], new_worker: Optional[str], new_status: str):
+        if old_worker and old_status in OPEN_TASK_STATUSES:
+            self.adjust(old_worker, -1)
+        if new_worker and new_status in OPEN_TASK_STATUSES:
+            self.adjust(new_worker, 1)
+    
+    def recommend(self, category: Optional[str]) -> Optional[str]:
+        # Least-loaded worker with the matching specialization. Only categories
+        # without a specialization fall back to anyone.
+        specialization = CATEGORY_SPECIALIZATIONS.get(category)
+        key = specialization or "*"
+        heap = self._heaps.get(key)
+        while heap:
+            open_tasks, worker_id = heap[0]
+            worker = self.workers.get(worker_id)
+            if worker is not None and worker['open_tasks'] == open_tasks and (key == "*" or worker['specialization'] == key):
+                return worker_id
+            heapq.heappop(heap)
+        return None
+
+assignment_engine = AssignmentEngine()
+
+async def reload_assignment_engine():
+    # Resync workload counts from Mongo; covers bus events lost or replayed
+    while True:
+        await asyncio.sleep(ASSIGNMENT_RELOAD_SECONDS)
+        try:
+            await assignment_engine.load()
+        except Exception:
+            logger.exception("Failed to reload worker assignment index")
+
+def register_worker(worker_id: str, specialization: Optional[str]):
+    if assignment_engine.loaded:
+        assignment_engine.add_worker(worker_id, specialization)
+    invalidation_bus.publish("worker", {"worker_id": worker_id, "specialization": specialization})
+
+def apply_remote_notifications(payload: dict):
+    for notification in payload['notifications']:
+        notification_hub.publish(notification)
+
+def apply_remote_worker(payload: dict):
+    if assignment_engine.loaded:
+        assignment_engine.add_worker(payload['worker_id'], payload.get('specialization'))
+
+# Changes made by other worker processes
+invalidation_bus.on("user", lambda payload: user_cache.invalidate(payload['user_id']))
+invalidation_bus.on("admins", lambda payload: admin_ids_cache.clear())
+invalidation_bus.on("notifications", apply_remote_notifications)
+invalidation_bus.on("workload", lambda payload: assignment_engine.set_open_tasks(payload['worker_id'], payload['open_tasks']))
+invalidation_bus.on("worker", apply_remote_worker)
+
+def track_assignment(complaint: dict, new_status: str, new_worker: Optional[str] = None):
+    # Keep the engine's workload counts in step with a representative's transition
+    if complaint.get('representative_id') is None:
+        assignment_engine.on_transition(
+            complaint.get('assigned_to'),
+            complaint.get('status'),
+            new_worker or complaint.get('assigned_to'),
+            new_status
+        )
+
+async def finish_assignments(assignments: List[tuple], actor_id: str, track: bool = True):
+    # Bookkeeping for applied (complaint_before, worker_id) assignments made by actor_id
+    if not assignments:
+        return
+    await apply_analytics_deltas(*(analytics_delta(complaint, complaint['status'], "Assigned") for complaint, _ in assignments))
+    now = utc_now()
+    await db.worker_logs.insert_many([
+        WorkerLog(
+            worker_id=worker_id, complaint_id=complaint['id'], action="Assigned",
+            actor_id=actor_id, actor_role="admin", created_at=now
+        ).model_dump()
+        for complaint, worker_id in assignments
+    ])
+    await apply_worker_rollups(
+        *((worker_id, now, {"assigned": 1}) for _, worker_id in assignments),
+        *(rollup for complaint, _ in assignments for rollup in completion_rollups(complaint, "Assigned"))
+    )
+    scopes = set()
+    for complaint, worker_id in assignments:
+        scopes |= complaint_scopes(complaint, worker_id=worker_id)
+    await bump_versions(scopes)
+    notifications = []
+    for complaint, worker_id in assignments:
+        if track:
+            track_assignment(complaint, "Assigned", worker_id)
+        notifications.append((
+            complaint['resident_id'],
+            complaint['id'],
+            "Complaint Approved",
+            "Your complaint has been approved and assigned to a worker"
+        ))
+        notifications.append((
+            worker_id,
+            complaint['id'],
+            "New Task Assigned",
+            f"You have been assigned a new task: {complaint['category']}"
+        ))
+    await notify_many(notifications)
+
+async def assign_complaint(complaint_id: str, worker_id: str, actor_id: str) -> Optional[dict]:
+    # Returns the complaint as it was before the assignment, or None if missing
+    now = utc_now()
+    complaint = await db.complaints.find_one_and_update(
         {"id": complaint_id},
-        {"$set": {"priority": priority}}
+        {"$set": {
+            "status": "Assigned",
+            "assigned_to": worker_id,
+            "assigned_at": now,
+            "updated_at": now
+        }},
+        {"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
+    if complaint:
+        await finish_assignments([(complaint, worker_id)], actor_id)
+    return complaint
+
+async def apply_assignments(assignments: List[tuple], actor_id: str, track: bool = True) -> List[tuple]:
+    # Apply (complaint, worker_id) pairs with one bulk_write. Each update is
+    # guarded by the status we read, so complaints changed concurrently are
+    # skipped; returns the pairs that were applied. Pass track=False when the
+    # caller already counted the assignments in the engine.
+    if not assignments:
+        return []
+    now = utc_now()
+    result = await db.complaints.bulk_write([
+        UpdateOne(
+            {"id": complaint['id'], "status": complaint['status']},
+            {"$set": {"status": "Assigned", "assigned_to": worker_id, "assigned_at": now, "updated_at": now}}
+        )
+        for complaint, worker_id in assignments
+    ], ordered=False)
+    
+    applied = assignments
+    if result.matched_count < len(assignments):
+        changed = await db.complaints.find(
+            {"id": {"$in": [complaint['id'] for complaint, _ in assignments]}, "updated_at": now},
+            {"_id": 0, "id": 1}
+        ).to_list(None)
+        changed_ids = {doc['id'] for doc in changed}
+        applied = [(complaint, worker_id) for complaint, worker_id in assignments if complaint['id'] in changed_ids]
+    
+    await finish_assignments(applied, actor_id, track)
+    return applied
+
+USER_SUMMARY_PROJECTION = {"_id": 0, "id": 1, "full_name": 1, "email": 1, "specialization": 1}
+
+async def get_users_by_ids(user_ids) -> dict:
+    # Resolve many user references with a single $in query
+    ids = list({uid for uid in user_ids if uid})
+    if not ids:
+        return {}
+    users = await db.users.find({"id": {"$in": ids}}, USER_SUMMARY_PROJECTION).to_list(len(ids))
+    return {user['id']: user for user in users}
+
+async def enrich_complaints(complaints: List[dict], resident: bool = False, worker: bool = False) -> List[dict]:
+    # Attach resident/worker info to a page of complaints in one round trip
+    user_ids = []
+    if resident:
+        user_ids.extend(c.get('resident_id') for c in complaints)
+    if worker:
+        user_ids.extend(c.get('assigned_to') for c in complaints)
+    users = await get_users_by_ids(user_ids)
+    
+    for complaint in complaints:
+        if resident:
+            resident_user = users.get(complaint.get('resident_id'))
+            complaint['resident_name'] = resident_user.get('full_name') if resident_user else None
+            complaint['resident_email'] = resident_user.get('email') if resident_user else None
+        if worker and complaint.get('assigned_to'):
+            worker_user = users.get(complaint['assigned_to'])
+            complaint['assigned_worker_name'] = worker_user.get('full_name') if worker_user else None
+            complaint['assigned_worker_specialization'] = worker_user.get('specialization') if worker_user else None
+    
+    return complaints
+
+def json_response(content, response: Optional[Response] = None) -> ORJSONResponse:
+    # Serialize straight to orjson, skipping FastAPI's jsonable_encoder pass.
+    # Returning a Response bypasses the injected one, so copy its headers over.
+    return ORJSONResponse(content, headers=dict(response.headers) if response is not None else None)
+
+def list_projection(fields: Optional[str] = None) -> dict:
+    # fields: comma separated LIST_DETAIL_FIELDS to include
+    requested = {field.strip() for field in fields.split(",")} if fields else set()
+    projection = {"_id": 0}
+    for field in LIST_DETAIL_FIELDS:
+        if field not in requested:
+            projection[field] = 0
+    return projection
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False
+) -> dict:
+    return {"limit": limit, "cursor": cursor, "include_total": include_total}
+
+def complaint_filters(
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    floor: Optional[str] = None,
+    category: Optional[str] = None
+) -> dict:
+    # Comma-separated values match any of the listed values
+    filters = {}
+    for field, value in (("status", status), ("priority", priority), ("floor", floor), ("category", category)):
+        if value:
+            values = [v.strip() for v in value.split(",") if v.strip()]
+            filters[field] = values[0] if len(values) == 1 else {"$in": values}
+    return filters
+
+def encode_cursor(doc: dict) -> str:
+    # Rows not yet migrated by migrate_timestamps.py still carry string
+    # timestamps, so the cursor records which type to compare against
+    created_at = doc['created_at']
+    is_date = isinstance(created_at, datetime)
+    raw = json.dumps([created_at.isoformat() if is_date else created_at, doc['id'], is_date]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, doc_id, is_date = json.loads(raw)
+        if is_date:
+            created_at = datetime.fromisoformat(created_at)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return created_at, doc_id
+
+async def paginate(collection, query: dict, projection: dict, page: dict, response: Response, total: Optional[int] = None) -> List[dict]:
+    # Keyset pagination on (created_at, id), newest first. The next page cursor
+    # and optional total are returned as headers so the body stays a plain list.
+    # Callers that already know the total (e.g. from the analytics summary)
+    # pass it to skip the count.
+    page_query = query
+    if page['cursor']:
+        created_at, doc_id = decode_cursor(page['cursor'])
+        after_cursor = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": doc_id}}
+        ]
+        # $lt only compares within a BSON type. Dates sort above strings, so
+        # after a date cursor every row not yet migrated to a date still follows.
+        if isinstance(created_at, datetime):
+            after_cursor.append({"created_at": {"$type": "string"}})
+        page_query = {"$and": [query, {"$or": after_cursor}]}
+    
+    limit = page['limit']
+    docs = await collection.find(page_query, projection).sort(
+        [("created_at", DESCENDING), ("id", DESCENDING)]
+    ).limit(limit + 1).to_list(limit + 1)
+    
+    if len(docs) > limit:
+        docs = docs[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(docs[-1])
+    
+    if page['include_total']:
+        if total is None:
+            total = await collection.count_documents(query)
+        response.headers["X-Total-Count"] = str(total)
+    
+    return docs
+
+def summary_key(value) -> str:
+    # Mongo field names cannot contain dots or start with $
+    return str(value if value is not None else "Unknown").replace(".", "_").lstrip("$") or "Unknown"
+
+def resolution_bucket(hours: float) -> str:
+    return str(bisect.bisect_right(RESOLUTION_BUCKET_HOURS, max(hours, 0)) - 1)
+
+def as_datetime(value) -> Optional[datetime]:
+    # Rows not yet migrated by migrate_timestamps.py hold ISO strings; naive ones are UTC
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return None
+
+def resolution_hours(created_at, resolved_at) -> Optional[float]:
+    created = as_datetime(created_at)
+    resolved_dt = as_datetime(resolved_at)
+    if created is None or resolved_dt is None:
+        return None
+    return (resolved_dt - created).total_seconds() / 3600
+
+def analytics_delta(complaint: dict, old_status: Optional[str], new_status: str, resolved_at=None) -> dict:
+    # $inc document for one status transition of a representative complaint;
+    # old_status is None for a newly created complaint. Leaving Completed (or
+    # completing again) takes back the resolution from the previous resolved_at.
+    delta = defaultdict(int)
+    if complaint.get('representative_id') is not None or (old_status == new_status and new_status != "Completed"):
+        return {}
+    
+    category = summary_key(complaint.get('category'))
+    floor = summary_key(complaint.get('floor'))
+    if old_status is None:
+        delta.update({"total": 1, f"category.{category}.total": 1, f"floor.{floor}.total": 1})
+    else:
+        delta[f"status.{summary_key(old_status)}"] -= 1
+    delta[f"status.{summary_key(new_status)}"] += 1
+    
+    for status, sign, at in ((old_status, -1, complaint.get('resolved_at')), (new_status, 1, resolved_at)):
+        if status != "Completed":
+            continue
+        delta[f"category.{category}.resolved"] += sign
+        delta[f"floor.{floor}.resolved"] += sign
+        hours = resolution_hours(complaint.get('created_at'), at)
+        if hours is not None:
+            delta["resolution.count"] += sign
+            delta["resolution.total_hours"] += sign * hours
+            delta[f"resolution.buckets.{resolution_bucket(hours)}"] += sign
+    return {field: value for field, value in delta.items() if value}
+
+async def apply_analytics_deltas(*deltas: dict):
+    # Merge transitions into a single $inc on the summary document. A missing
+    # summary is left alone; it is rebuilt from scratch on the next read.
+    merged = {}
+    for delta in deltas:
+        for field, value in delta.items():
+            merged[field] = merged.get(field, 0) + value
+    if merged:
+        await db.analytics.update_one({"_id": ANALYTICS_SUMMARY_ID}, {"$inc": merged})
+
+def as_date(field: str) -> dict:
+    # Dates pass through; legacy ISO strings are parsed at second precision
+    return {"$cond": [
+        {"$eq": [{"$type": field}, "string"]},
+        {"$dateFromString": {
+            "dateString": {"$substrBytes": [field, 0, 19]},
+            "format": "%Y-%m-%dT%H:%M:%S",
+            "timezone": "UTC",
+            "onError": None,
+            "onNull": None
+        }},
+        field
+    ]}
+
+async def rebuild_analytics_summary() -> dict:
+    resolved_counter = {"$sum": {"$cond": [{"$eq": ["$status", "Completed"]}, 1, 0]}}
+    pipeline = [
+        {"$match": {"representative_id": None}},
+        {"$facet": {
+            "status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "category": [{"$group": {"_id": "$category", "total": {"$sum": 1}, "resolved": resolved_counter}}],
+            "floor": [{"$group": {"_id": "$floor", "total": {"$sum": 1}, "resolved": resolved_counter}}],
+            "resolution": [
+                {"$match": {"status": "Completed", "resolved_at": {"$ne": None}}},
+                {"$project": {"hours": {"$divide": [
+                    {"$subtract": [as_date("$resolved_at"), as_date("$created_at")]}, 3600000
+                ]}}},
+                {"$match": {"hours": {"$ne": None}}},
+                {"$bucket": {
+                    "groupBy": {"$max": ["$hours", 0]},
+                    "boundaries": RESOLUTION_BUCKET_HOURS,
+                    "default": "overflow",
+                    "output": {"count": {"$sum": 1}, "total_hours": {"$sum": "$hours"}}
+                }}
+            ]
+        }}
+    ]
+    result = (await db.complaints.aggregate(pipeline).to_list(1))[0]
+    summary = summary_from_facets(result)
+    await db.analytics.replace_one({"_id": ANALYTICS_SUMMARY_ID}, summary, upsert=True)
+    return summary
+
+def summary_from_facets(result: dict) -> dict:
+    # $bucket ids are lower bounds (past the last one, "overflow"); map them
+    # onto resolution_bucket()'s indexes so incremental deltas line up
+    summary = {
+        "total": sum(row['count'] for row in result['status']),
+        "status": {summary_key(row['_id']): row['count'] for row in result['status']},
+        "category": {summary_key(row['_id']): {"total": row['total'], "resolved": row['resolved']} for row in result['category']},
+        "floor": {summary_key(row['_id']): {"total": row['total'], "resolved": row['resolved']} for row in result['floor']},
+        "resolution": {"count": 0, "total_hours": 0, "buckets": {}},
+        "rebuilt_at": utc_now()
+    }
+    for row in result['resolution']:
+        if row['_id'] == "overflow":
+            bucket = str(len(RESOLUTION_BUCKET_HOURS) - 1)
+        else:
+            bucket = str(RESOLUTION_BUCKET_HOURS.index(row['_id']))
+        buckets = summary['resolution']['buckets']
+        buckets[bucket] = buckets.get(bucket, 0) + row['count']
+        summary['resolution']['count'] += row['count']
+        summary['resolution']['total_hours'] += row['total_hours']
+    return summary
+
+async def get_analytics_summary() -> dict:
+    summary = await db.analytics.find_one({"_id": ANALYTICS_SUMMARY_ID})
+    if summary is None:
+        summary = await rebuild_analytics_summary()
+    return summary
+
+def day_key(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%d")
+
+async def apply_worker_rollups(*rollups: tuple):
+    # rollups: (worker_id, at, {field: increment}). Merged per worker-day into
+    # one upserting $inc each, written with a single bulk_write.
+    merged = defaultdict(dict)
+    for worker_id, at, fields in rollups:
+        if not worker_id:
+            continue
+        counters = merged[(worker_id, day_key(at))]
+        for field, value in fields.items():
+            counters[field] = counters.get(field, 0) + value
+    if merged:
+        await db.worker_daily_stats.bulk_write([
+            UpdateOne(
+                {"_id": f"{worker_id}|{day}"},
+                {"$inc": counters, "$setOnInsert": {"worker_id": worker_id, "day": day}},
+                upsert=True
+            )
+            for (worker_id, day), counters in merged.items()
+        ], ordered=False)
+
+def completion_rollups(complaint: dict, new_status: str, resolved_at=None) -> List[tuple]:
+    # A worker is credited with a completion while the complaint is Completed,
+    # on its resolved_at day, as rebuild_worker_rollups counts it. Leaving
+    # Completed (or completing again) takes the previous completion back.
+    worker_id = complaint.get('assigned_to')
+    if not worker_id or complaint.get('representative_id') is not None:
+        return []
+    rollups = []
+    for status, sign, at in ((complaint.get('status'), -1, complaint.get('resolved_at')), (new_status, 1, resolved_at)):
+        at = as_datetime(at)
+        if status != "Completed" or at is None:
+            continue
+        fields = {"completed": sign}
+        hours = resolution_hours(complaint.get('assigned_at'), at)
+        if hours is not None:
+            fields.update({"resolution_hours_total": sign * hours, "resolution_count": sign})
+        rollups.append((worker_id, at, fields))
+    return rollups
+
+async def record_review(complaint: dict, action: str, at: datetime, actor_id: str):
+    # Log an admin review against the assigned worker and roll it up
+    worker_id = complaint.get('assigned_to')
+    if not worker_id or complaint.get('representative_id') is not None:
+        return
+    log = WorkerLog(
+        worker_id=worker_id, complaint_id=complaint['id'], action=action,
+        actor_id=actor_id, actor_role="admin", created_at=at
+    )
+    await db.worker_logs.insert_one(log.model_dump())
+    
+    rollups = completion_rollups(complaint, action, at if action == "Completed" else None)
+    if action == "RequestedChanges":
+        rollups.append((worker_id, at, {"requested_changes": 1}))
+    await apply_worker_rollups(*rollups)
+
+def as_day(field: str) -> dict:
+    return {"$dateToString": {"format": "%Y-%m-%d", "date": as_date(field), "timezone": "UTC", "onNull": None}}
+
+async def rebuild_worker_rollups():
+    # Recompute every worker-day from worker_logs (assignments, rework and the
+    # worker's own actions) and from completed complaints (completions and
+    # assignment-to-completion time), merging both into worker_daily_stats
+    await db.worker_daily_stats.delete_many({})
+    rollup_fields = {
+        "_id": {"$concat": ["$_id.worker_id", "|", "$_id.day"]},
+        "worker_id": "$_id.worker_id",
+        "day": "$_id.day"
+    }
+    merge = {"$merge": {"into": "worker_daily_stats", "whenMatched": "merge", "whenNotMatched": "insert"}}
+    valid_key = {"$match": {"_id.worker_id": {"$ne": None}, "_id.day": {"$ne": None}}}
+    
+    await db.worker_logs.aggregate([
+        {"$group": {
+            "_id": {"worker_id": "$worker_id", "day": as_day("$created_at")},
+            "assigned": {"$sum": {"$cond": [{"$eq": ["$action", "Assigned"]}, 1, 0]}},
+            "requested_changes": {"$sum": {"$cond": [{"$eq": ["$action", "RequestedChanges"]}, 1, 0]}},
+            "actions": {"$sum": {"$cond": [{"$eq": ["$actor_role", "admin"]}, 0, 1]}}
+        }},
+        valid_key,
+        {"$project": {**rollup_fields, "assigned": 1, "requested_changes": 1, "actions": 1}},
+        merge
+    ], allowDiskUse=True).to_list(None)
+    
+    await db.complaints.aggregate([
+        {"$match": {"representative_id": None, "status": "Completed", "assigned_to": {"$ne": None}, "resolved_at": {"$ne": None}}},
+        {"$project": {
+            "assigned_to": 1,
+            "resolved_at": 1,
+            "hours": {"$cond": [
+                {"$ifNull": ["$assigned_at", False]},
+                {"$divide": [{"$subtract": [as_date("$resolved_at"), as_date("$assigned_at")]}, 3600000]},
+                None
+            ]}
+        }},
+        {"$group": {
+            "_id": {"worker_id": "$assigned_to", "day": as_day("$resolved_at")},
+            "completed": {"$sum": 1},
+            "resolution_hours_total": {"$sum": {"$ifNull": ["$hours", 0]}},
+            "resolution_count": {"$sum": {"$cond": [{"$eq": [{"$ifNull": ["$hours", None]}, None]}, 0, 1]}}
+        }},
+        valid_key,
+        {"$project": {**rollup_fields, "completed": 1, "resolution_hours_total": 1, "resolution_count": 1}},
+        merge
+    ], allowDiskUse=True).to_list(None)
+    
+    await db.analytics.replace_one({"_id": WORKER_ROLLUPS_ID}, {"rebuilt_at": utc_now()}, upsert=True)
+
+async def ensure_worker_rollups():
+    # Rollups are only trusted once a full rebuild has run
+    if not await db.analytics.find_one({"_id": WORKER_ROLLUPS_ID}):
+        await rebuild_worker_rollups()
+
+def histogram_percentile(buckets: dict, count: int, percentile: float) -> float:
+    # Linear interpolation inside the bucket holding the requested rank
+    if not count:
+        return 0
+    target = percentile * count
+    seen = 0
+    for index, lower in enumerate(RESOLUTION_BUCKET_HOURS):
+        in_bucket = buckets.get(str(index), 0)
+        if in_bucket and seen + in_bucket >= target:
+            if index + 1 == len(RESOLUTION_BUCKET_HOURS):
+                return lower
+            upper = RESOLUTION_BUCKET_HOURS[index + 1]
+            return lower + (upper - lower) * (target - seen) / in_bucket
+        seen += in_bucket
+    return RESOLUTION_BUCKET_HOURS[-1]
+
+def dedup_key_for(floor: str, category: str, subcategory: str) -> str:
+    return f"{floor}|{category}|{subcategory}"
+
+async def insert_common_area_complaint(complaint: dict) -> Optional[dict]:
+    # Either link to the open representative (atomically bumping its count and
+    # priority) or become the representative. If two submissions race to become
+    # it, the unique dedup_key index rejects the loser, which then links instead.
+    # Returns the representative that was linked to, if any.
+    dedup_key = dedup_key_for(complaint['floor'], complaint['category'], complaint['subcategory'])
+    for _ in range(DEDUP_MAX_ATTEMPTS):
+        representative = await db.complaints.find_one_and_update(
+            {"dedup_key": dedup_key},
+            [
+                {"$set": {"count": {"$add": ["$count", 1]}, "updated_at": utc_now()}},
+                {"$set": {"priority": PRIORITY_BY_COUNT}}
+            ],
+            {"_id": 0, "id": 1, "resident_id": 1, "assigned_to": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if representative:
+            complaint['representative_id'] = representative['id']
+            await db.complaints.insert_one(complaint)
+            return representative
+        
+        try:
+            await db.complaints.insert_one({**complaint, "dedup_key": dedup_key})
+            return None
+        except DuplicateKeyError:
+            continue
+    raise HTTPException(status_code=409, detail="Could not register complaint, please retry")
+
+async def backfill_dedup_keys():
+    # Give open representatives created before dedup_key existed their key; the
+    # oldest one wins if several are open for the same location
+    cursor = db.complaints.find({
+        "complaint_type": "common_area",
+        "representative_id": None,
+        "status": {"$nin": CLOSED_STATUSES},
+        "dedup_key": {"$exists": False}
+    }, {"_id": 0, "id": 1, "floor": 1, "category": 1, "subcategory": 1}).sort("created_at", ASCENDING)
+    async for doc in cursor:
+        try:
+            await db.complaints.update_one(
+                {"id": doc['id']},
+                {"$set": {"dedup_key": dedup_key_for(doc['floor'], doc['category'], doc['subcategory'])}}
+            )
+        except DuplicateKeyError:
+            pass
+
+def sla_windows(since: Optional[datetime], until: datetime) -> List[tuple]:
+    # (query, priority) per category SLA and escalation step: complaints whose
+    # age crossed the step's threshold between the two scans. Each branch is a
+    # range on the (representative_id, status, created_at) index.
+    sla_groups = defaultdict(list)
+    for category, hours in CATEGORY_SLA_HOURS.items():
+        sla_groups[hours].append(category)
+    categories = [(hours, {"$in": names}) for hours, names in sla_groups.items()]
+    categories.append((DEFAULT_SLA_HOURS, {"$nin": list(CATEGORY_SLA_HOURS)}))
+    
+    windows = []
+    for hours, category_filter in categories:
+        for multiple, priority in SLA_ESCALATION_STEPS:
+            age = timedelta(hours=hours * multiple)
+            created = {"$lte": until - age}
+            if since is not None:
+                created["$gt"] = since - age
+            windows.append(({
+                "representative_id": None,
+                "status": {"$in": SLA_STATUSES},
+                "category": category_filter,
+                "created_at": created,
+                "priority": {"$in": PRIORITY_LEVELS[:PRIORITY_LEVELS.index(priority)]}
+            }, priority))
+    return windows
+
+def sla_priority(complaint: dict, now: datetime) -> Optional[str]:
+    hours = CATEGORY_SLA_HOURS.get(complaint.get('category'), DEFAULT_SLA_HOURS)
+    age_hours = (now - complaint['created_at']).total_seconds() / 3600
+    target = None
+    for multiple, priority in SLA_ESCALATION_STEPS:
+        if age_hours >= hours * multiple:
+            target = priority
+    return target
+
+class SLAEscalator:
+    # Periodically raises the priority of complaints that outlive their SLA.
+    # Each scan only covers the thresholds crossed since the previous one; the
+    # watermark lives in Mongo so restarts and other processes resume from it.
+    state_id = "sla_escalation"
+    
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task = None
+        self.escalated = 0
+        self.last_scan_at = None
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            try:
+                await self.scan()
+            except Exception:
+                logger.exception("SLA escalation scan failed")
+            await asyncio.sleep(self.interval)
+    
+    async def _claim(self, now: datetime):
+        # Advance the watermark first so concurrent processes never scan the
+        # same window; returns (claimed, previous watermark)
+        state = await db.scheduler_state.find_one({"_id": self.state_id})
+        since = state.get('watermark') if state else None
+        try:
+            result = await db.scheduler_state.update_one(
+                {"_id": self.state_id, "watermark": since},
+                {"$set": {"watermark": now}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return False, since
+        return bool(result.matched_count or result.upserted_id), since
+    
+    async def scan(self) -> int:
+        now = utc_now()
+        claimed, since = await self._claim(now)
+        if not claimed:
+            return 0
+        
+        try:
+            escalated = 0
+            batch = []
+            query = {"$or": [window for window, _ in sla_windows(since, now)]}
+            cursor = db.complaints.find(
+                query, {"_id": 0, "id": 1, "resident_id": 1, "assigned_to": 1, "category": 1, "floor": 1,
+                        "priority": 1, "created_at": 1}
+            ).batch_size(self.batch_size)
+            async for complaint in cursor:
+                batch.append(complaint)
+                if len(batch) >= self.batch_size:
+                    escalated += await self._escalate(batch, now, notify=since is not None)
+                    batch = []
+            if batch:
+                escalated += await self._escalate(batch, now, notify=since is not None)
+        except Exception:
+            # Hand the window back so the next scan retries it
+            await db.scheduler_state.update_one({"_id": self.state_id, "watermark": now}, {"$set": {"watermark": since}})
+            raise
+        
+        self.escalated += escalated
+        self.last_scan_at = now
+        if escalated:
+            logger.info("Escalated %d complaints past their SLA", escalated)
+        return escalated
+    
+    async def _escalate(self, complaints: List[dict], now: datetime, notify: bool) -> int:
+        escalations = []
+        for complaint in complaints:
+            target = sla_priority(complaint, now)
+            if target and PRIORITY_LEVELS.index(target) > PRIORITY_LEVELS.index(complaint.get('priority', "Low")):
+                escalations.append((complaint, target))
+        if not escalations:
+            return 0
+        
+        # Guarded by the priority we read so concurrent changes are never lowered
+        result = await db.complaints.bulk_write([
+            UpdateOne(
+                {"id": complaint['id'], "priority": complaint.get('priority', "Low")},
+                {"$set": {"priority": target, "updated_at": now}}
+            )
+            for complaint, target in escalations
+        ], ordered=False)
+        if result.matched_count < len(escalations):
+            current = await db.complaints.find(
+                {"id": {"$in": [complaint['id'] for complaint, _ in escalations]}},
+                {"_id": 0, "id": 1, "updated_at": 1}
+            ).to_list(None)
+            applied = {doc['id'] for doc in current if doc.get('updated_at') == now}
+            escalations = [(complaint, target) for complaint, target in escalations if complaint['id'] in applied]
+        
+        # The first scan catches up on the whole backlog; only later, incremental
+        # scans notify so admins are not flooded on rollout
+        if notify and escalations:
+            admin_ids = await get_admin_ids()
+            await notify_many([
+                (
+                    admin_id,
+                    complaint['id'],
+                    "Complaint Escalated",
+                    f"{complaint.get('category')} complaint on floor {complaint.get('floor')} passed its SLA; priority raised to {target}"
+                )
+                for complaint, target in escalations
+                for admin_id in admin_ids
+            ])
+        await bump_versions(complaint_scopes(*(complaint for complaint, _ in escalations)))
+        return len(escalations)
+    
+    def stats(self) -> dict:
+        return {
+            "escalated": self.escalated,
+            "last_scan_at": self.last_scan_at.isoformat() if self.last_scan_at else None
+        }
+
+sla_escalator = SLAEscalator(SLA_SCAN_INTERVAL_SECONDS, SLA_BATCH_SIZE)
+
+def media_urls(media_id: str, has_thumbnail: bool) -> dict:
+    return {
+        "media_id": media_id,
+        "media_url": f"/api/media/{media_id}",
+        "thumbnail_url": f"/api/media/{media_id}/thumbnail" if has_thumbnail else None
+    }
+
+def render_thumbnail(source) -> Optional[bytes]:
+    # source is a path-like or binary file object; returns JPEG bytes
+    try:
+        with Image.open(source) as image:
+            image.thumbnail(MEDIA_THUMBNAIL_SIZE)
+            output = BytesIO()
+            image.convert("RGB").save(output, format="JPEG", quality=80)
+            return output.getvalue()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+async def store_thumbnail(media_id: str, source) -> bool:
+    loop = asyncio.get_running_loop()
+    thumbnail = await loop.run_in_executor(None, render_thumbnail, source)
+    if thumbnail is None:
+        return False
+    await media_bucket.upload_from_stream_with_id(
+        f"{media_id}.thumb",
+        f"{media_id}.jpg",
+        thumbnail,
+        metadata={"content_type": "image/jpeg", "thumbnail_of": media_id}
     )
+    return True
+
+def is_inline_media(content_type: str) -> bool:
+    # Raster images and video are safe to serve inline; everything else is not
+    return content_type.startswith(("image/", "video/")) and content_type not in BLOCKED_MEDIA_TYPES
+
+def check_media_type(content_type: Optional[str]) -> str:
+    content_type = (content_type or "application/octet-stream").split(";")[0].strip().lower()
+    if not is_inline_media(content_type):
+        raise HTTPException(status_code=415, detail="Only image and video uploads are supported")
+    return content_type
+
+async def store_upload(upload: UploadFile, owner_id: str) -> dict:
+    # Stream the upload into GridFS chunk by chunk, enforcing the size limit
+    content_type = check_media_type(upload.content_type)
+    
+    media_id = str(uuid.uuid4())
+    grid_in = media_bucket.open_upload_stream_with_id(
+        media_id,
+        upload.filename or media_id,
+        metadata={"content_type": content_type, "owner_id": owner_id}
+    )
+    size = 0
+    while chunk := await upload.read(MEDIA_CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_MEDIA_BYTES:
+            await grid_in.abort()
+            raise HTTPException(status_code=413, detail="File too large")
+        await grid_in.write(chunk)
+    await grid_in.close()
+    
+    has_thumbnail = False
+    if content_type.startswith("image/"):
+        await upload.seek(0)
+        has_thumbnail = await store_thumbnail(media_id, upload.file)
+    return media_urls(media_id, has_thumbnail)
+
+async def externalize_media(value: Optional[str], owner_id: str) -> Optional[dict]:
+    # Older clients send media as base64 data URLs; move those into GridFS so
+    # documents only carry a reference. Anything else is kept as-is.
+    if not value:
+        return None
+    if value.startswith("/api/media/"):
+        # Attaching media to a complaint grants its assignee access, so only the uploader may
+        media_id = value[len("/api/media/"):].split("?")[0].split("/")[0]
+        await authorize_media(media_id, {"id": owner_id, "role": None})
+    if not value.startswith("data:"):
+        return {"media_url": value, "thumbnail_url": None}
+    
+    try:
+        header, encoded = value.split(",", 1)
+        data = base64.b64decode(encoded, validate=True) if ";base64" in header else encoded.encode()
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid media data")
+    content_type = check_media_type(header[5:])
+    if len(data) > MAX_MEDIA_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
+    
+    media_id = str(uuid.uuid4())
+    await media_bucket.upload_from_stream_with_id(
+        media_id,
+        media_id,
+        data,
+        chunk_size_bytes=MEDIA_CHUNK_SIZE,
+        metadata={"content_type": content_type, "owner_id": owner_id}
+    )
+    has_thumbnail = False
+    if content_type.startswith("image/"):
+        has_thumbnail = await store_thumbnail(media_id, BytesIO(data))
+    return media_urls(media_id, has_thumbnail)
+
+def parse_range(range_header: str, length: int):
+    # Single "bytes=start-end" range -> (start, end) inclusive, or None if unsatisfiable
+    try:
+        unit, spec = range_header.split("=", 1)
+        if unit.strip() != "bytes" or "," in spec:
+            return None
+        start_text, end_text = spec.strip().split("-", 1)
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else length - 1
+        else:
+            start = length - int(end_text)
+            end = length - 1
+    except ValueError:
+        return None
+    start = max(start, 0)
+    end = min(end, length - 1)
+    if start > end:
+        return None
+    return start, end
+
+async def authorize_media(media_id: str, user: dict):
+    # Admins see all media; others only what they uploaded or what is attached
+    # to a complaint assigned to them
+    if user['role'] == 'admin':
+        return
+    media = await db["media.files"].find_one({"_id": media_id}, {"metadata.owner_id": 1})
+    if media is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    if (media.get('metadata') or {}).get('owner_id') == user['id']:
+        return
+    if user['role'] == 'worker' and await db.complaints.find_one(
+        {"assigned_to": user['id'], "media_url": media_urls(media_id, False)['media_url']},
+        {"_id": 0, "id": 1}
+    ):
+        return
+    raise HTTPException(status_code=403, detail="Access denied")
+
+async def stream_media(file_id: str, request: Request) -> Response:
+    try:
+        grid_out = await media_bucket.open_download_stream(file_id)
+    except NoFile:
+        raise HTTPException(status_code=404, detail="Media not found")
+    
+    # Media ids are immutable, so the id doubles as a strong validator
+    etag = f'"{file_id}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": MEDIA_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "X-Content-Type-Options": "nosniff",
+        "Content-Security-Policy": "default-src 'none'; sandbox"
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    length = grid_out.length
+    start, end = 0, length - 1
+    status_code = 200
+    range_header = request.headers.get("range")
+    if range_header and length:
+        byte_range = parse_range(range_header, length)
+        if byte_range is None:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{length}"})
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+    headers["Content-Length"] = str(end - start + 1 if length else 0)
+    
+    async def body():
+        grid_out.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await grid_out.read(min(MEDIA_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    
+    # Files stored before the type allow-list existed may claim anything;
+    # only raster images and video are rendered inline
+    content_type = (grid_out.metadata or {}).get("content_type", "application/octet-stream")
+    if not is_inline_media(content_type):
+        content_type = "application/octet-stream"
+        headers["Content-Disposition"] = "attachment"
+    return StreamingResponse(body(), status_code=status_code, media_type=content_type, headers=headers)
 
 # Auth Routes
 @api_router.post("/auth/register")
@@ -188,19 +2106,34 @@ async def register(user_data: UserRegister):
     )
     
     user_dict = user.model_dump()
-    user_dict['password_hash'] = hash_password(user_data.password)
+    user_dict['password_hash'] = await hash_password(user_data.password)
     
     await db.users.insert_one(user_dict)
+    if user.role == 'admin':
+        invalidate_admin_ids()
+    elif user.role == 'worker':
+        register_worker(user.id, user.specialization)
     
     token = create_access_token({"sub": user.id})
-    return {"token": token, "user": user.model_dump()}
+    user_dict.pop('_id', None)
+    user_dict.pop('password_hash')
+    return json_response({"token": token, "user": user_dict})
 
 @api_router.post("/auth/login")
 async def login(login_data: LoginRequest):
     user = await db.users.find_one({"email": login_data.email}, {"_id": 0})
-    if not user or not verify_password(login_data.password, user['password_hash']):
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
+    valid, new_hash = await verify_and_update_password(login_data.password, user['password_hash'])
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    
+    # Transparently rehash when the configured bcrypt cost changed
+    if new_hash:
+        await db.users.update_one({"id": user['id']}, {"$set": {"password_hash": new_hash}})
+        invalidate_cached_user(user['id'])
+    
     # Admin authorization check
     if user['role'] == 'admin':
         admin_email = os.environ.get('ADMIN_EMAIL')
@@ -220,21 +2153,33 @@ async def get_me(current_user: dict = Depends(get_current_user)):
     user_copy.pop('password_hash', None)
     return user_copy
 
+# For URLs the browser requests itself (EventSource, <img>), which cannot carry the header
+@api_router.post("/auth/query-token")
+async def get_query_token(current_user: dict = Depends(get_current_user)):
+    return {"token": create_query_token(current_user['id']), "expires_in": QUERY_TOKEN_SECONDS}
+
 # Resident Routes
 @api_router.get("/resident/complaints")
-async def get_resident_complaints(current_user: dict = Depends(get_current_user)):
+async def get_resident_complaints(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(complaint_filters),
+    projection: dict = Depends(list_projection),
+    page: dict = Depends(page_params),
+    current_user: dict = Depends(get_current_user)
+):
     if current_user['role'] != 'resident':
         raise HTTPException(status_code=403, detail="Access denied")
     
-    complaints = await db.complaints.find({"resident_id": current_user['id']}, {"_id": 0}).to_list(1000)
+    not_modified = await check_not_modified(request, response, f"complaints:resident:{current_user['id']}")
+    if not_modified:
+        return not_modified
     
-    # For each complaint, get assigned worker info if available
-    for complaint in complaints:
-        if complaint.get('assigned_to'):
-            worker = await db.users.find_one({"id": complaint['assigned_to']}, {"_id": 0, "full_name": 1})
-            complaint['assigned_worker_name'] = worker.get('full_name') if worker else None
+    query = {"resident_id": current_user['id'], **filters}
+    complaints = await paginate(db.complaints, query, projection, page, response)
     
-    return complaints
+    # Attach assigned worker info if available
+    return json_response(await enrich_complaints(complaints, worker=True), response)
 
 @api_router.post("/resident/complaints")
 async def create_complaint(complaint_data: ComplaintCreate, current_user: dict = Depends(get_current_user)):
@@ -243,7 +2188,7 @@ async def create_complaint(complaint_data: ComplaintCreate, current_user: dict =
     
     # Check for duplicate personal room complaints within 24 hours
     if complaint_data.complaint_type == 'personal_room':
-        yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        yesterday = utc_now() - timedelta(days=1)
         existing = await db.complaints.find_one({
             "resident_id": current_user['id'],
             "complaint_type": "personal_room",
@@ -254,28 +2199,8 @@ async def create_complaint(complaint_data: ComplaintCreate, current_user: dict =
         if existing:
             raise HTTPException(status_code=400, detail="You already submitted a similar complaint within 24 hours")
     
-    # For common area complaints, check for representative
-    representative_id = None
-    if complaint_data.complaint_type == 'common_area':
-        representative = await db.complaints.find_one({
-            "complaint_type": "common_area",
-            "category": complaint_data.category,
-            "subcategory": complaint_data.subcategory,
-            "floor": complaint_data.floor,
-            "representative_id": None,
-            "status": {"$nin": ["Completed", "Rejected"]}
-        }, {"_id": 0})
-        
-        if representative:
-            representative_id = representative['id']
-            # Increment count
-            new_count = representative['count'] + 1
-            await db.complaints.update_one(
-                {"id": representative_id},
-                {"$set": {"count": new_count, "updated_at": datetime.now(timezone.utc).isoformat()}}
-            )
-            # Update priority
-            await update_priority(representative_id, new_count)
+    # Keep only a reference to the media on the complaint
+    media = await externalize_media(complaint_data.media_url, current_user['id'])
     
     # Create complaint
     complaint = Complaint(
@@ -286,111 +2211,426 @@ async def create_complaint(complaint_data: ComplaintCreate, current_user: dict =
         category=complaint_data.category,
         subcategory=complaint_data.subcategory,
         description=complaint_data.description,
-        media_url=complaint_data.media_url,
-        representative_id=representative_id
+        media_url=media['media_url'] if media else None,
+        media_thumbnail_url=media['thumbnail_url'] if media else None
     )
     
-    await db.complaints.insert_one(complaint.model_dump())
+    # Common area complaints are linked to an open representative if one exists
+    # Dumped once; the insert adds _id to the document, which is dropped again below
+    complaint_doc = complaint.model_dump()
+    representative = None
+    if complaint.complaint_type == 'common_area':
+        representative = await insert_common_area_complaint(complaint_doc)
+    else:
+        await db.complaints.insert_one(complaint_doc)
+    complaint_doc.pop('_id', None)
+    await apply_analytics_deltas(analytics_delta(complaint_doc, None, complaint.status))
+    await bump_versions(complaint_scopes(complaint_doc, *([representative] if representative else [])))
     
     # Notify admin
-    admins = await db.users.find({"role": "admin"}, {"_id": 0, "id": 1}).to_list(100)
-    for admin in admins:
-        await create_notification(
-            admin['id'],
-            complaint.id,
-            "New Complaint",
-            f"New {complaint_data.complaint_type.replace('_', ' ')} complaint submitted"
-        )
+    await notify_users(
+        await get_admin_ids(),
+        complaint.id,
+        "New Complaint",
+        f"New {complaint_data.complaint_type.replace('_', ' ')} complaint submitted"
+    )
     
-    return complaint.model_dump()
+    return json_response(complaint_doc)
 
 # Admin Routes
 @api_router.get("/admin/complaints")
-async def get_admin_complaints(current_user: dict = Depends(get_current_user)):
+async def get_admin_complaints(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(complaint_filters),
+    projection: dict = Depends(list_projection),
+    page: dict = Depends(page_params),
+    current_user: dict = Depends(get_current_user)
+):
     if current_user['role'] != 'admin':
         raise HTTPException(status_code=403, detail="Access denied")
     
+    not_modified = await check_not_modified(request, response, "complaints:admin")
+    if not_modified:
+        return not_modified
+    
     # Get only representative complaints (representative_id is None)
-    complaints = await db.complaints.find({"representative_id": None}, {"_id": 0}).to_list(1000)
+    query = {"representative_id": None, **filters}
+    # The summary counts exactly the representatives, so the unfiltered total is free
+    total = None
+    if page['include_total'] and not filters:
+        total = (await get_analytics_summary()).get('total', 0)
+    complaints = await paginate(db.complaints, query, projection, page, response, total)
     
-    # For each complaint, get resident and worker info
-    for complaint in complaints:
-        resident = await db.users.find_one({"id": complaint['resident_id']}, {"_id": 0, "full_name": 1, "email": 1})
-        complaint['resident_name'] = resident.get('full_name') if resident else None
-        complaint['resident_email'] = resident.get('email') if resident else None
-        
-        if complaint.get('assigned_to'):
-            worker = await db.users.find_one({"id": complaint['assigned_to']}, {"_id": 0, "full_name": 1, "specialization": 1})
-            complaint['assigned_worker_name'] = worker.get('full_name') if worker else None
-            complaint['assigned_worker_specialization'] = worker.get('specialization') if worker else None
+    # Attach resident and worker info
+    return json_response(await enrich_complaints(complaints, resident=True, worker=True), response)
+
+@api_router.get("/admin/complaints/search")
+async def search_complaints(
+    request: Request,
+    response: Response,
+    q: Optional[str] = Query(None, max_length=200),
+    sort: str = Query("relevance", pattern="^(relevance|recent)$"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    assigned_to: Optional[str] = None,
+    filters: dict = Depends(complaint_filters),
+    projection: dict = Depends(list_projection),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
     
-    return complaints
+    not_modified = await check_not_modified(request, response, "complaints:admin")
+    if not_modified:
+        return not_modified
+    
+    query = {"representative_id": None, **filters}
+    if assigned_to:
+        query["assigned_to"] = assigned_to
+    q = q.strip() if q else None
+    if q:
+        query["$text"] = {"$search": q}
+    
+    pipeline = [{"$match": query}]
+    if q and sort == "relevance":
+        pipeline.append({"$sort": {"score": {"$meta": "textScore"}, "created_at": -1, "id": -1}})
+    else:
+        pipeline.append({"$sort": {"created_at": -1, "id": -1}})
+    
+    # One pass over the matches yields the page, the total and every facet
+    facets = {
+        field: [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}, {"$sort": {"count": -1, "_id": 1}}]
+        for field in SEARCH_FACETS
+    }
+    results = [{"$skip": (page - 1) * limit}, {"$limit": limit}, {"$project": projection}]
+    if q:
+        results.append({"$addFields": {"score": {"$meta": "textScore"}}})
+    pipeline.append({"$facet": {
+        "results": results,
+        "total": [{"$count": "count"}],
+        **facets
+    }})
+    
+    data = (await db.complaints.aggregate(pipeline, allowDiskUse=True).to_list(1))[0]
+    complaints = await enrich_complaints(data['results'], resident=True, worker=True)
+    
+    workers = await get_users_by_ids(bucket['_id'] for bucket in data['assigned_to'])
+    facet_counts = {
+        field: [{"value": bucket['_id'], "count": bucket['count']} for bucket in data[field]]
+        for field in SEARCH_FACETS
+    }
+    for bucket in facet_counts['assigned_to']:
+        worker = workers.get(bucket['value'])
+        bucket['name'] = worker.get('full_name') if worker else None
+    
+    return json_response({
+        "results": complaints,
+        "total": data['total'][0]['count'] if data['total'] else 0,
+        "page": page,
+        "limit": limit,
+        "facets": facet_counts
+    }, response)
 
 @api_router.get("/admin/workers")
-async def get_workers(current_user: dict = Depends(get_current_user)):
+async def get_workers(
+    response: Response,
+    page: dict = Depends(page_params),
+    current_user: dict = Depends(get_current_user)
+):
     if current_user['role'] != 'admin':
         raise HTTPException(status_code=403, detail="Access denied")
     
-    workers = await db.users.find({"role": "worker"}, {"_id": 0, "id": 1, "full_name": 1, "specialization": 1}).to_list(1000)
-    return workers
+    projection = {"_id": 0, "id": 1, "full_name": 1, "specialization": 1, "created_at": 1}
+    workers = await paginate(db.users, {"role": "worker"}, projection, page, response)
+    
+    # Live workload from the assignment engine
+    await assignment_engine.ensure_loaded()
+    for worker in workers:
+        worker['open_tasks'] = assignment_engine.open_tasks(worker['id'])
+    return json_response(workers, response)
 
 @api_router.put("/admin/complaints/{complaint_id}/approve")
 async def approve_complaint(complaint_id: str, worker_id: str = Form(...), note: Optional[str] = Form(None), current_user: dict = Depends(get_current_user)):
     if current_user['role'] != 'admin':
         raise HTTPException(status_code=403, detail="Access denied")
     
-    complaint = await db.complaints.find_one({"id": complaint_id}, {"_id": 0})
+    # Assign and notify resident and worker
+    complaint = await assign_complaint(complaint_id, worker_id, current_user['id'])
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
     
-    await db.complaints.update_one(
-        {"id": complaint_id},
-        {"$set": {
-            "status": "Assigned",
-            "assigned_to": worker_id,
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }}
-    )
+    return {"message": "Complaint approved and assigned"}
+
+async def cascade_to_linked(complaint: dict, update: Optional[dict], title: str, message: str):
+    await cascade_many([(complaint, update, title, message)])
+
+async def cascade_many(transitions: List[tuple]):
+    # transitions: (complaint, update, title, message). Apply each
+    # representative's transition to every complaint linked to it, then notify
+    # its resident and all linked residents, in one bulk_write, one find and
+    # one outbox batch however many representatives changed
+    representatives = {
+        complaint['id']: update for complaint, update, _, _ in transitions if complaint.get('representative_id') is None
+    }
+    updates = [UpdateMany({"representative_id": rep_id}, update) for rep_id, update in representatives.items() if update]
+    if updates:
+        await db.complaints.bulk_write(updates, ordered=False)
     
-    # Notify resident and worker
-    await create_notification(
-        complaint['resident_id'],
-        complaint_id,
-        "Complaint Approved",
-        f"Your complaint has been approved and assigned to a worker"
-    )
+    linked = defaultdict(list)
+    if representatives:
+        docs = await db.complaints.find(
+            {"representative_id": {"$in": list(representatives)}},
+            {"_id": 0, "id": 1, "resident_id": 1, "representative_id": 1}
+        ).to_list(None)
+        for doc in docs:
+            linked[doc['representative_id']].append(doc)
+        await bump_versions(
+            f"complaints:resident:{doc['resident_id']}" for doc in docs if representatives[doc['representative_id']]
+        )
     
-    await create_notification(
-        worker_id,
-        complaint_id,
-        "New Task Assigned",
-        f"You have been assigned a new task: {complaint['category']}"
-    )
+    notifications = []
+    for complaint, _, title, message in transitions:
+        notifications.append((complaint['resident_id'], complaint['id'], title, message))
+        notifications.extend((doc['resident_id'], doc['id'], title, message) for doc in linked.get(complaint['id'], ()))
+    await notify_many(notifications)
+
+async def recommended_worker(category: Optional[str]) -> Optional[dict]:
+    await assignment_engine.ensure_loaded()
+    worker_id = assignment_engine.recommend(category)
+    if worker_id is None:
+        return None
+    worker = (await get_users_by_ids([worker_id])).get(worker_id, {"id": worker_id})
+    return {
+        "id": worker_id,
+        "full_name": worker.get('full_name'),
+        "specialization": worker.get('specialization'),
+        "open_tasks": assignment_engine.open_tasks(worker_id)
+    }
+
+@api_router.get("/admin/complaints/{complaint_id}/recommended-worker")
+async def get_recommended_worker(complaint_id: str, current_user: dict = Depends(get_current_user)):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
     
-    return {"message": "Complaint approved and assigned"}
+    complaint = await db.complaints.find_one({"id": complaint_id}, {"_id": 0, "category": 1})
+    if not complaint:
+        raise HTTPException(status_code=404, detail="Complaint not found")
+    
+    return {"worker": await recommended_worker(complaint['category'])}
 
-@api_router.put("/admin/complaints/{complaint_id}/reject")
-async def reject_complaint(complaint_id: str, rejection_reason: str = Form(...), current_user: dict = Depends(get_current_user)):
+@api_router.put("/admin/complaints/{complaint_id}/auto-assign")
+async def auto_assign_complaint(complaint_id: str, current_user: dict = Depends(get_current_user)):
     if current_user['role'] != 'admin':
         raise HTTPException(status_code=403, detail="Access denied")
     
-    complaint = await db.complaints.find_one({"id": complaint_id}, {"_id": 0})
+    complaint = await db.complaints.find_one({"id": complaint_id}, {"_id": 0, "category": 1})
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
     
-    await db.complaints.update_one(
+    worker = await recommended_worker(complaint['category'])
+    if worker is None:
+        specialization = CATEGORY_SPECIALIZATIONS.get(complaint['category'])
+        raise HTTPException(
+            status_code=409,
+            detail=f"No active {specialization} available" if specialization else "No active worker available"
+        )
+    
+    if not await assign_complaint(complaint_id, worker['id'], current_user['id']):
+        raise HTTPException(status_code=404, detail="Complaint not found")
+    return {"message": "Complaint approved and assigned", "worker": worker}
+
+@api_router.post("/admin/complaints/assign-pending")
+async def assign_pending_complaints(
+    limit: int = Query(MAX_BULK_ASSIGN, ge=1, le=MAX_BULK_ASSIGN),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    # Oldest pending first, each to the currently least-loaded matching worker
+    await assignment_engine.ensure_loaded()
+    pending = await db.complaints.find(
+        {"representative_id": None, "status": "Pending"},
+        {"_id": 0, "id": 1, "resident_id": 1, "category": 1, "floor": 1, "status": 1, "assigned_to": 1, "representative_id": 1}
+    ).sort("created_at", ASCENDING).limit(limit).to_list(limit)
+    
+    assignments, unassigned = [], []
+    for complaint in pending:
+        worker_id = assignment_engine.recommend(complaint['category'])
+        if worker_id is None:
+            unassigned.append(complaint['id'])
+            continue
+        # Count the task now so the next recommendation sees the new load
+        assignment_engine.adjust(worker_id, 1)
+        assignments.append((complaint, worker_id))
+    
+    applied = await apply_assignments(assignments, current_user['id'], track=False)
+    applied_ids = {complaint['id'] for complaint, _ in applied}
+    for complaint, worker_id in assignments:
+        if complaint['id'] not in applied_ids:
+            assignment_engine.adjust(worker_id, -1)
+    
+    return {
+        "assigned": [{"complaint_id": complaint['id'], "worker_id": worker_id} for complaint, worker_id in applied],
+        "skipped": [complaint['id'] for complaint, _ in assignments if complaint['id'] not in applied_ids],
+        "unassigned": unassigned
+    }
+
+@api_router.post("/admin/complaints/bulk-approve")
+async def bulk_approve_complaints(payload: BulkApproveRequest, current_user: dict = Depends(get_current_user)):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    # Validate every item against one $in fetch per collection
+    complaint_ids = [item.complaint_id for item in payload.items]
+    complaints = await db.complaints.find(
+        {"id": {"$in": complaint_ids}},
+        {"_id": 0, "id": 1, "resident_id": 1, "category": 1, "floor": 1, "status": 1, "assigned_to": 1,
+         "representative_id": 1, "created_at": 1, "resolved_at": 1, "assigned_at": 1}
+    ).to_list(None)
+    complaints = {complaint['id']: complaint for complaint in complaints}
+    workers = await db.users.find(
+        {"id": {"$in": [item.worker_id for item in payload.items]}, "role": "worker"},
+        {"_id": 0, "id": 1}
+    ).to_list(None)
+    worker_ids = {worker['id'] for worker in workers}
+    
+    # results[i] answers payload.items[i]; None until the write decides it
+    results, assignments, seen = [], [], set()
+    for item in payload.items:
+        complaint = complaints.get(item.complaint_id)
+        result = None
+        if item.complaint_id in seen:
+            result = "duplicate"
+        elif complaint is None:
+            result = "not_found"
+        elif item.worker_id not in worker_ids:
+            result = "invalid_worker"
+        elif complaint['status'] in CLOSED_STATUSES:
+            result = "closed"
+        else:
+            assignments.append((complaint, item.worker_id))
+        results.append(result)
+        seen.add(item.complaint_id)
+    
+    # One bulk_write; notifications go out in one outbox batch
+    applied = await apply_assignments(assignments, current_user['id'])
+    applied_ids = {complaint['id'] for complaint, _ in applied}
+    return {
+        "approved": len(applied),
+        "results": [
+            {"complaint_id": item.complaint_id, "result": result or ("approved" if item.complaint_id in applied_ids else "conflict")}
+            for item, result in zip(payload.items, results)
+        ]
+    }
+
+@api_router.post("/admin/complaints/bulk-reject")
+async def bulk_reject_complaints(payload: BulkRejectRequest, current_user: dict = Depends(get_current_user)):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    complaints = await db.complaints.find(
+        {"id": {"$in": [item.complaint_id for item in payload.items]}},
+        {"_id": 0, "id": 1, "resident_id": 1, "category": 1, "floor": 1, "status": 1, "assigned_to": 1,
+         "representative_id": 1, "created_at": 1, "resolved_at": 1, "assigned_at": 1}
+    ).to_list(None)
+    complaints = {complaint['id']: complaint for complaint in complaints}
+    
+    results, rejections, seen = [], [], set()
+    for item in payload.items:
+        complaint = complaints.get(item.complaint_id)
+        result = None
+        if item.complaint_id in seen:
+            result = "duplicate"
+        elif complaint is None:
+            result = "not_found"
+        elif complaint['status'] == "Rejected":
+            result = "unchanged"
+        else:
+            rejections.append((complaint, item.rejection_reason))
+        results.append(result)
+        seen.add(item.complaint_id)
+    
+    applied = []
+    if rejections:
+        # Guarded by the status we read, like apply_assignments
+        now = utc_now()
+        result = await db.complaints.bulk_write([
+            UpdateOne(
+                {"id": complaint['id'], "status": complaint['status']},
+                {"$set": {"status": "Rejected", "rejection_reason": reason, "updated_at": now},
+                 "$unset": {"dedup_key": ""}}
+            )
+            for complaint, reason in rejections
+        ], ordered=False)
+        applied = rejections
+        if result.matched_count < len(rejections):
+            changed = await db.complaints.find(
+                {"id": {"$in": [complaint['id'] for complaint, _ in rejections]}, "updated_at": now},
+                {"_id": 0, "id": 1}
+            ).to_list(None)
+            changed_ids = {doc['id'] for doc in changed}
+            applied = [(complaint, reason) for complaint, reason in rejections if complaint['id'] in changed_ids]
+        
+        await apply_analytics_deltas(*(analytics_delta(complaint, complaint['status'], "Rejected") for complaint, _ in applied))
+        await apply_worker_rollups(*(rollup for complaint, _ in applied for rollup in completion_rollups(complaint, "Rejected")))
+        scopes = set()
+        for complaint, _ in applied:
+            track_assignment(complaint, "Rejected")
+            scopes |= complaint_scopes(complaint)
+        await bump_versions(scopes)
+        
+        await cascade_many([
+            (
+                complaint,
+                {"$set": {"status": "Rejected", "rejection_reason": reason, "updated_at": now}},
+                "Complaint Rejected",
+                f"Your complaint has been rejected. Reason: {reason}"
+            )
+            for complaint, reason in applied
+        ])
+    
+    applied_ids = {complaint['id'] for complaint, _ in applied}
+    return {
+        "rejected": len(applied),
+        "results": [
+            {"complaint_id": item.complaint_id, "result": result or ("rejected" if item.complaint_id in applied_ids else "conflict")}
+            for item, result in zip(payload.items, results)
+        ]
+    }
+
+@api_router.put("/admin/complaints/{complaint_id}/reject")
+async def reject_complaint(complaint_id: str, rejection_reason: str = Form(...), current_user: dict = Depends(get_current_user)):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    complaint = await db.complaints.find_one_and_update(
         {"id": complaint_id},
         {"$set": {
             "status": "Rejected",
             "rejection_reason": rejection_reason,
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }}
+            "updated_at": utc_now()
+        }, "$unset": {"dedup_key": ""}},
+        {"_id": 0},
+        return_document=ReturnDocument.BEFORE
     )
+    if not complaint:
+        raise HTTPException(status_code=404, detail="Complaint not found")
     
-    # Notify resident
-    await create_notification(
-        complaint['resident_id'],
-        complaint_id,
+    await apply_analytics_deltas(analytics_delta(complaint, complaint['status'], "Rejected"))
+    await apply_worker_rollups(*completion_rollups(complaint, "Rejected"))
+    track_assignment(complaint, "Rejected")
+    await bump_versions(complaint_scopes(complaint))
+    
+    # Reject linked complaints too and notify every resident
+    await cascade_to_linked(
+        complaint,
+        {"$set": {
+            "status": "Rejected",
+            "rejection_reason": rejection_reason,
+            "updated_at": utc_now()
+        }},
         "Complaint Rejected",
         f"Your complaint has been rejected. Reason: {rejection_reason}"
     )
@@ -402,46 +2642,57 @@ async def review_complaint(complaint_id: str, action: str = Form(...), current_u
     if current_user['role'] != 'admin':
         raise HTTPException(status_code=403, detail="Access denied")
     
-    complaint = await db.complaints.find_one({"id": complaint_id}, {"_id": 0})
-    if not complaint:
-        raise HTTPException(status_code=404, detail="Complaint not found")
-    
+    now = utc_now()
     if action == "Completed":
-        await db.complaints.update_one(
+        complaint = await db.complaints.find_one_and_update(
             {"id": complaint_id},
             {"$set": {
                 "status": "Completed",
-                "resolved_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }}
+                "resolved_at": now,
+                "updated_at": now
+            }, "$unset": {"dedup_key": ""}},
+            {"_id": 0},
+            return_document=ReturnDocument.BEFORE
         )
-        
-        # Mark all linked complaints as completed
-        await db.complaints.update_many(
-            {"representative_id": complaint_id},
+    elif action == "RequestedChanges":
+        complaint = await db.complaints.find_one_and_update(
+            {"id": complaint_id},
             {"$set": {
-                "status": "Completed",
-                "resolved_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }}
+                "status": "RequestedChanges",
+                "updated_at": now
+            }},
+            {"_id": 0},
+            return_document=ReturnDocument.BEFORE
         )
+    else:
+        complaint = await db.complaints.find_one({"id": complaint_id}, {"_id": 0})
+    if not complaint:
+        raise HTTPException(status_code=404, detail="Complaint not found")
+    
+    if action in ("Completed", "RequestedChanges"):
+        await bump_versions(complaint_scopes(complaint))
+    
+    if action == "Completed":
+        await apply_analytics_deltas(analytics_delta(complaint, complaint['status'], "Completed", now))
+        track_assignment(complaint, "Completed")
+        await record_review(complaint, "Completed", now, current_user['id'])
         
-        # Notify resident
-        await create_notification(
-            complaint['resident_id'],
-            complaint_id,
+        # Mark all linked complaints as completed and notify every resident
+        await cascade_to_linked(
+            complaint,
+            {"$set": {
+                "status": "Completed",
+                "resolved_at": now,
+                "updated_at": now
+            }},
             "Complaint Completed",
             "Your complaint has been resolved and marked as completed"
         )
         
     elif action == "RequestedChanges":
-        await db.complaints.update_one(
-            {"id": complaint_id},
-            {"$set": {
-                "status": "RequestedChanges",
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }}
-        )
+        await apply_analytics_deltas(analytics_delta(complaint, complaint['status'], "RequestedChanges"))
+        track_assignment(complaint, "RequestedChanges")
+        await record_review(complaint, "RequestedChanges", now, current_user['id'])
         
         # Notify worker
         if complaint.get('assigned_to'):
@@ -459,67 +2710,309 @@ async def get_analytics(current_user: dict = Depends(get_current_user)):
     if current_user['role'] != 'admin':
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Total complaints (representative only)
-    total = await db.complaints.count_documents({"representative_id": None})
+    # Counts come from the incrementally maintained summary (representative complaints only)
+    summary = await get_analytics_summary()
+    status_counts = summary.get('status', {})
+    resolution = summary.get('resolution', {})
+    resolved_count = resolution.get('count', 0)
+    buckets = resolution.get('buckets', {})
     
-    # Resolved complaints
-    resolved = await db.complaints.count_documents({"status": "Completed", "representative_id": None})
+    # Active Workers
+    active_workers = await db.users.count_documents({"role": "worker", "is_active": True})
     
-    # In Progress
-    in_progress = await db.complaints.count_documents({"status": {"$in": ["Assigned", "In Progress"]}, "representative_id": None})
+    avg_time = resolution.get('total_hours', 0) / resolved_count if resolved_count else 0
     
-    # Pending
-    pending = await db.complaints.count_documents({"status": "Pending", "representative_id": None})
+    return {
+        "total_complaints": summary.get('total', 0),
+        "resolved_complaints": status_counts.get('Completed', 0),
+        "in_progress": status_counts.get('Assigned', 0) + status_counts.get('In Progress', 0),
+        "pending_complaints": status_counts.get('Pending', 0),
+        "active_workers": active_workers,
+        "avg_resolution_time": round(avg_time, 2),
+        "median_resolution_time": round(histogram_percentile(buckets, resolved_count, 0.5), 2),
+        "p90_resolution_time": round(histogram_percentile(buckets, resolved_count, 0.9), 2),
+        "by_status": status_counts,
+        "by_category": [
+            {"category": name, "total": counts.get('total', 0), "resolved": counts.get('resolved', 0)}
+            for name, counts in sorted(summary.get('category', {}).items())
+        ],
+        "by_floor": [
+            {"floor": name, "total": counts.get('total', 0), "resolved": counts.get('resolved', 0)}
+            for name, counts in sorted(summary.get('floor', {}).items())
+        ]
+    }
+
+@api_router.post("/admin/analytics/rebuild")
+async def rebuild_analytics(current_user: dict = Depends(get_current_user)):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
     
-    # Active Workers
-    active_workers = await db.users.count_documents({"role": "worker", "is_active": True})
+    await rebuild_analytics_summary()
+    return {"message": "Analytics summary rebuilt"}
+
+@api_router.get("/admin/complaints/{complaint_id}/timeline")
+async def get_complaint_timeline(complaint_id: str, current_user: dict = Depends(get_current_user)):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
     
-    # Average Resolution Time
-    resolved_complaints = await db.complaints.find({
-        "status": "Completed",
-        "representative_id": None,
-        "resolved_at": {"$exists": True}
-    }, {"_id": 0, "created_at": 1, "resolved_at": 1}).to_list(1000)
+    complaint = await db.complaints.find_one({"id": complaint_id}, {"_id": 0, "description": 0, "media_url": 0})
+    if not complaint:
+        raise HTTPException(status_code=404, detail="Complaint not found")
+    logs = await db.worker_logs.find({"complaint_id": complaint_id}, {"_id": 0}).sort("created_at", ASCENDING).to_list(None)
     
-    avg_time = 0
-    if resolved_complaints:
-        total_time = 0
-        for c in resolved_complaints:
-            try:
-                created = datetime.fromisoformat(c['created_at'])
-                resolved_dt = datetime.fromisoformat(c['resolved_at'])
-                total_time += (resolved_dt - created).total_seconds() / 3600  # in hours
-            except:
-                pass
-        avg_time = total_time / len(resolved_complaints) if resolved_complaints else 0
+    events = [{"at": complaint['created_at'], "event": "Created", "user_id": complaint['resident_id']}]
+    events.extend(
+        {
+            "at": log['created_at'], "event": log['action'], "user_id": log.get('actor_id'),
+            "actor_role": log.get('actor_role'), "worker_id": log['worker_id'], "proof_media": log.get('proof_media')
+        }
+        for log in logs
+    )
+    # Transitions that predate admin review logging, or are not logged per worker
+    if complaint.get('resolved_at') and not any(log['action'] == "Completed" for log in logs):
+        events.append({"at": complaint['resolved_at'], "event": "Completed", "user_id": None})
+    if complaint['status'] == "Rejected":
+        events.append({
+            "at": complaint['updated_at'], "event": "Rejected", "user_id": None,
+            "reason": complaint.get('rejection_reason')
+        })
+    # Mixed string/date timestamps cannot be compared until they are normalised
+    for event in events:
+        event['at'] = as_datetime(event['at'])
+    events.sort(key=lambda event: event['at'] or datetime.min.replace(tzinfo=timezone.utc))
+    
+    users = await get_users_by_ids(event['user_id'] for event in events)
+    for event in events:
+        user = users.get(event['user_id'])
+        event['user_name'] = user.get('full_name') if user else None
+    return json_response({"complaint": complaint, "events": events})
+
+@api_router.get("/admin/workers/productivity")
+async def get_worker_productivity(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    worker_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    # Whole UTC days, both ends inclusive; the last PRODUCTIVITY_DEFAULT_DAYS by default
+    end_at = parse_date_param(end, "end") or utc_now()
+    start_at = parse_date_param(start, "start") or end_at - timedelta(days=PRODUCTIVITY_DEFAULT_DAYS - 1)
+    query = {"day": {"$gte": day_key(start_at), "$lte": day_key(end_at)}}
+    if worker_id:
+        query["worker_id"] = worker_id
+    
+    def total(field: str) -> dict:
+        return {"$sum": {"$ifNull": [f"${field}", 0]}}
+    
+    rows = await db.worker_daily_stats.aggregate([
+        {"$match": query},
+        {"$sort": {"day": 1}},
+        {"$group": {
+            "_id": "$worker_id",
+            "assigned": total("assigned"),
+            "completed": total("completed"),
+            "requested_changes": total("requested_changes"),
+            "actions": total("actions"),
+            "resolution_hours_total": total("resolution_hours_total"),
+            "resolution_count": total("resolution_count"),
+            "daily": {"$push": {"day": "$day", "completed": {"$ifNull": ["$completed", 0]}}}
+        }},
+        {"$sort": {"completed": -1, "_id": 1}}
+    ]).to_list(None)
+    
+    workers = await get_users_by_ids(row['_id'] for row in rows)
+    report = []
+    for row in rows:
+        worker = workers.get(row['_id'], {})
+        # Rework rate: share of admin reviews that sent the task back
+        reviews = row['completed'] + row['requested_changes']
+        report.append({
+            "worker_id": row['_id'],
+            "full_name": worker.get('full_name'),
+            "specialization": worker.get('specialization'),
+            "assigned": row['assigned'],
+            "completed": row['completed'],
+            "requested_changes": row['requested_changes'],
+            "actions": row['actions'],
+            "mean_hours_to_complete": round(row['resolution_hours_total'] / row['resolution_count'], 2) if row['resolution_count'] else None,
+            "rework_rate": round(row['requested_changes'] / reviews, 4) if reviews else None,
+            "completed_per_day": row['daily']
+        })
+    
+    return {"start": day_key(start_at), "end": day_key(end_at), "workers": report}
+
+@api_router.post("/admin/workers/productivity/rebuild")
+async def rebuild_worker_productivity(current_user: dict = Depends(get_current_user)):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    await rebuild_worker_rollups()
+    return {"message": "Worker productivity rollups rebuilt"}
+
+@api_router.get("/admin/stats")
+async def get_stats(current_user: dict = Depends(get_current_user)):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
     
     return {
-        "total_complaints": total,
-        "resolved_complaints": resolved,
-        "in_progress": in_progress,
-        "pending_complaints": pending,
-        "active_workers": active_workers,
-        "avg_resolution_time": round(avg_time, 2)
+        "user_cache": user_cache.stats(),
+        "admin_ids_cache": admin_ids_cache.stats(),
+        "notification_outbox": notification_outbox.stats(),
+        "notification_streams": notification_hub.stats(),
+        "sla_escalation": sla_escalator.stats(),
+        "invalidation_bus": invalidation_bus.stats()
+    }
+
+@api_router.get("/admin/diagnostics/query-plans")
+async def get_query_plans(current_user: dict = Depends(get_current_user)):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    plans = await explain_hot_queries()
+    return {
+        "collection_scans": [plan['name'] for plan in plans if plan['collection_scan']],
+        "plans": plans
     }
 
+def parse_date_param(value: Optional[str], name: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} date")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def created_between(start: Optional[str], end: Optional[str]) -> dict:
+    # start is inclusive, end exclusive; both ISO 8601 dates or datetimes
+    bounds = {}
+    start_at = parse_date_param(start, "start")
+    end_at = parse_date_param(end, "end")
+    if start_at:
+        bounds["$gte"] = start_at
+    if end_at:
+        bounds["$lt"] = end_at
+    return {"created_at": bounds} if bounds else {}
+
+def csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+async def export_stream(cursor, export_format: str, columns: List[str]):
+    # Serialize a cursor row by row, flushing roughly EXPORT_CHUNK_BYTES at a
+    # time, so memory stays flat however many documents match
+    chunk = bytearray()
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        async for doc in cursor:
+            writer.writerow([csv_value(doc.get(column)) for column in columns])
+            if buffer.tell() >= EXPORT_CHUNK_BYTES:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode()
+        return
+    
+    async for doc in cursor:
+        chunk += orjson.dumps(doc)
+        chunk += b"\n"
+        if len(chunk) >= EXPORT_CHUNK_BYTES:
+            yield bytes(chunk)
+            chunk.clear()
+    yield bytes(chunk)
+
+def export_response(cursor, export_format: str, columns: List[str], name: str) -> StreamingResponse:
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    extension = "csv" if export_format == "csv" else "ndjson"
+    filename = f"{name}-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.{extension}"
+    return StreamingResponse(
+        export_stream(cursor, export_format, columns),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@api_router.get("/admin/export/complaints")
+async def export_complaints(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    worker: Optional[str] = None,
+    representatives_only: bool = False,
+    filters: dict = Depends(complaint_filters),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    query = {**filters, **created_between(start, end)}
+    if worker:
+        query["assigned_to"] = worker
+    if representatives_only:
+        query["representative_id"] = None
+    
+    cursor = db.complaints.find(query, {"_id": 0}).sort("created_at", ASCENDING).batch_size(EXPORT_BATCH_SIZE)
+    return export_response(cursor, export_format, COMPLAINT_EXPORT_COLUMNS, "complaints")
+
+@api_router.get("/admin/export/worker-logs")
+async def export_worker_logs(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    worker: Optional[str] = None,
+    action: Optional[str] = None,
+    actor_role: Optional[str] = Query(None, pattern="^(admin|worker)$"),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    query = created_between(start, end)
+    if worker:
+        query["worker_id"] = worker
+    if action:
+        query["action"] = action
+    if actor_role:
+        query["actor_role"] = actor_role
+    
+    cursor = db.worker_logs.find(query, {"_id": 0}).sort("created_at", ASCENDING).batch_size(EXPORT_BATCH_SIZE)
+    return export_response(cursor, export_format, WORKER_LOG_EXPORT_COLUMNS, "worker-logs")
+
 # Worker Routes
 @api_router.get("/worker/tasks")
-async def get_worker_tasks(current_user: dict = Depends(get_current_user)):
+async def get_worker_tasks(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(complaint_filters),
+    projection: dict = Depends(list_projection),
+    page: dict = Depends(page_params),
+    current_user: dict = Depends(get_current_user)
+):
     if current_user['role'] != 'worker':
         raise HTTPException(status_code=403, detail="Access denied")
     
-    tasks = await db.complaints.find({
-        "assigned_to": current_user['id'],
-        "representative_id": None
-    }, {"_id": 0}).to_list(1000)
+    not_modified = await check_not_modified(request, response, f"complaints:worker:{current_user['id']}")
+    if not_modified:
+        return not_modified
     
-    # Get resident info
-    for task in tasks:
-        resident = await db.users.find_one({"id": task['resident_id']}, {"_id": 0, "full_name": 1, "email": 1})
-        task['resident_name'] = resident.get('full_name') if resident else None
-        task['resident_email'] = resident.get('email') if resident else None
+    query = {
+        "assigned_to": current_user['id'],
+        "representative_id": None,
+        **filters
+    }
+    tasks = await paginate(db.complaints, query, projection, page, response)
     
-    return tasks
+    # Attach resident info
+    return json_response(await enrich_complaints(tasks, resident=True), response)
 
 @api_router.put("/worker/tasks/{complaint_id}/status")
 async def update_task_status(
@@ -532,66 +3025,195 @@ async def update_task_status(
     if current_user['role'] != 'worker':
         raise HTTPException(status_code=403, detail="Access denied")
     
-    complaint = await db.complaints.find_one({"id": complaint_id}, {"_id": 0})
-    if not complaint:
-        raise HTTPException(status_code=404, detail="Complaint not found")
+    # Validate and store the proof before anything is written, so a rejected
+    # upload leaves the complaint, analytics and workload untouched
+    proof = await externalize_media(proof_media, current_user['id'])
     
     update_data = {
         "status": "Completed - Awaiting Admin Review" if status in ["Resolved", "Cannot be Resolved"] else status,
         "resolution": resolution,
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "updated_at": utc_now()
     }
     
-    await db.complaints.update_one(
+    complaint = await db.complaints.find_one_and_update(
         {"id": complaint_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        {"_id": 0},
+        return_document=ReturnDocument.BEFORE
     )
+    if not complaint:
+        raise HTTPException(status_code=404, detail="Complaint not found")
     
-    # Log worker action
+    await apply_analytics_deltas(analytics_delta(complaint, complaint['status'], update_data['status']))
+    track_assignment(complaint, update_data['status'])
+    await bump_versions(complaint_scopes(complaint))
+    
+    # Log worker action, keeping only a reference to the proof media
     log = WorkerLog(
         worker_id=current_user['id'],
         complaint_id=complaint_id,
         action=status,
-        proof_media=proof_media
+        actor_id=current_user['id'],
+        proof_media=proof['media_url'] if proof else None
     )
     await db.worker_logs.insert_one(log.model_dump())
+    await apply_worker_rollups(
+        (current_user['id'], log.created_at, {"actions": 1}),
+        *completion_rollups(complaint, update_data['status'])
+    )
     
     # Notify admin
-    admins = await db.users.find({"role": "admin"}, {"_id": 0, "id": 1}).to_list(100)
-    for admin in admins:
-        await create_notification(
-            admin['id'],
-            complaint_id,
-            "Task Update",
-            f"Worker has marked task as {status}"
-        )
-    
-    # Notify resident
-    await create_notification(
-        complaint['resident_id'],
+    await notify_users(
+        await get_admin_ids(),
         complaint_id,
         "Task Update",
+        f"Worker has marked task as {status}"
+    )
+    
+    # Carry the status to linked complaints and notify every resident
+    await cascade_to_linked(
+        complaint,
+        {"$set": {"status": update_data['status'], "updated_at": update_data['updated_at']}},
+        "Task Update",
         f"Your complaint status has been updated to: {status}"
     )
     
     return {"message": "Task updated"}
 
+# Media Routes
+@api_router.post("/media")
+async def upload_media(file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
+    return await store_upload(file, current_user['id'])
+
+# <img>/<video> tags cannot send headers, so downloads also take a ?token= query token
+@api_router.get("/media/{media_id}")
+async def download_media(media_id: str, request: Request, current_user: dict = Depends(get_stream_user)):
+    await authorize_media(media_id, current_user)
+    return await stream_media(media_id, request)
+
+@api_router.get("/media/{media_id}/thumbnail")
+async def download_media_thumbnail(media_id: str, request: Request, current_user: dict = Depends(get_stream_user)):
+    await authorize_media(media_id, current_user)
+    return await stream_media(f"{media_id}.thumb", request)
+
 @api_router.get("/notifications")
-async def get_notifications(current_user: dict = Depends(get_current_user)):
+async def get_notifications(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    not_modified = await check_not_modified(request, response, f"notifications:{current_user['id']}")
+    if not_modified:
+        return not_modified
+    
     notifications = await db.notifications.find(
         {"user_id": current_user['id']},
         {"_id": 0}
     ).sort("created_at", -1).to_list(100)
-    return notifications
+    return json_response(notifications, response)
+
+@api_router.get("/notifications/unread-count")
+async def get_unread_count(current_user: dict = Depends(get_current_user)):
+    counter = await db.notification_counters.find_one({"_id": current_user['id']})
+    # Mark-all-read may briefly run ahead of the outbox increment it raced with
+    return {"unread": max(counter['unread'], 0) if counter else 0}
+
+def format_sse(notification: dict) -> str:
+    return f"id: {notification['id']}\nevent: notification\ndata: {orjson.dumps(notification).decode()}\n\n"
+
+@api_router.get("/notifications/stream")
+async def stream_notifications(
+    request: Request,
+    last_event_id: Optional[str] = None,
+    current_user: dict = Depends(get_stream_user)
+):
+    user_id = current_user['id']
+    last_event_id = request.headers.get("last-event-id") or last_event_id
+    # Subscribe before replaying so nothing written in between is missed
+    queue = notification_hub.subscribe(user_id)
+    
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            replayed = set()
+            if last_event_id:
+                anchor = await db.notifications.find_one(
+                    {"id": last_event_id, "user_id": user_id},
+                    {"_id": 0, "created_at": 1}
+                )
+                if anchor:
+                    missed = await db.notifications.find(
+                        {"user_id": user_id, "created_at": {"$gte": anchor['created_at']}, "id": {"$ne": last_event_id}},
+                        {"_id": 0}
+                    ).sort("created_at", 1).to_list(NOTIFICATION_REPLAY_LIMIT)
+                    for notification in missed:
+                        replayed.add(notification['id'])
+                        yield format_sse(notification)
+            
+            while not await request.is_disconnected():
+                try:
+                    notification = await asyncio.wait_for(queue.get(), timeout=NOTIFICATION_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if notification['id'] not in replayed:
+                    yield format_sse(notification)
+        finally:
+            notification_hub.unsubscribe(user_id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.put("/notifications/read-all")
+async def mark_all_notifications_read(current_user: dict = Depends(get_current_user)):
+    result = await db.notifications.update_many(
+        {"user_id": current_user['id'], "is_read": False},
+        {"$set": {"is_read": True, "read_at": utc_now()}}
+    )
+    if result.modified_count:
+        await adjust_unread_counters({current_user['id']: -result.modified_count})
+        await bump_versions([f"notifications:{current_user['id']}"])
+    return {"message": "All notifications marked as read", "updated": result.modified_count}
 
 @api_router.put("/notifications/{notification_id}/read")
 async def mark_notification_read(notification_id: str, current_user: dict = Depends(get_current_user)):
-    await db.notifications.update_one(
-        {"id": notification_id, "user_id": current_user['id']},
-        {"$set": {"is_read": True}}
+    # Only the unread -> read transition touches the counter
+    result = await db.notifications.update_one(
+        {"id": notification_id, "user_id": current_user['id'], "is_read": False},
+        {"$set": {"is_read": True, "read_at": utc_now()}}
     )
+    if result.modified_count:
+        await adjust_unread_counters({current_user['id']: -1})
+        await bump_versions([f"notifications:{current_user['id']}"])
     return {"message": "Notification marked as read"}
 
+# Health Routes
+# Liveness: the process is serving requests
+@api_router.get("/health")
+async def health_check():
+    return {"status": "ok", "pid": os.getpid()}
+
+# Readiness: MongoDB answers and startup finished, so traffic can be routed here.
+# Missing indexes only make the instance degraded; they are retried in the background.
+@api_router.get("/ready")
+async def readiness_check():
+    checks = {"startup": app_state['started'], "indexes": app_state['indexes']}
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), READINESS_TIMEOUT_SECONDS)
+        checks["mongodb"] = True
+    except Exception:
+        checks["mongodb"] = False
+    ready = checks["startup"] and checks["mongodb"]
+    if not ready:
+        status = "not_ready"
+    elif not checks["indexes"]:
+        status = "degraded"
+    else:
+        status = "ready"
+    return ORJSONResponse(
+        {"status": status, "checks": checks, "invalidation_bus": invalidation_bus.stats()},
+        status_code=200 if ready else 503
+    )
+
 # Include router
 app.include_router(api_router)
 
@@ -601,6 +3223,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],      # ✅ allow all methods (GET, POST, PUT, DELETE)
     allow_headers=["*"],      # ✅ allow all custom headers
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
 )
 
 logging.basicConfig(
@@ -609,6 +3232,160 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
+def route_template(scope) -> Optional[str]:
+    for route in api_router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return None
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    route = route_template(request.scope) if request.url.path.startswith("/api") else None
+    if route is None:
+        return await call_next(request)
+    
+    key = (request.method, route)
+    request_metrics.started(key)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        request_metrics.finished(key, status_code, time.perf_counter() - started)
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def prometheus_labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels.items()) + "}"
+
+def prometheus_histogram(lines: List[str], name: str, histogram: Histogram, **labels):
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{prometheus_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_bucket{prometheus_labels(**labels, le='+Inf')} {histogram.count}")
+    lines.append(f"{name}_sum{prometheus_labels(**labels)} {histogram.sum}")
+    lines.append(f"{name}_count{prometheus_labels(**labels)} {histogram.count}")
+
+def render_metrics() -> str:
+    lines = [
+        "# HELP http_request_duration_seconds API request latency by route",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), histogram in sorted(request_metrics.latency.items()):
+        prometheus_histogram(lines, "http_request_duration_seconds", histogram, method=method, route=route)
+    lines += ["# HELP http_requests_in_flight API requests currently being served", "# TYPE http_requests_in_flight gauge"]
+    for (method, route), value in sorted(request_metrics.in_flight.items()):
+        lines.append(f"http_requests_in_flight{prometheus_labels(method=method, route=route)} {value}")
+    lines += ["# HELP http_responses_total API responses by route and status", "# TYPE http_responses_total counter"]
+    for (method, route, status), value in sorted(request_metrics.responses.items()):
+        lines.append(f"http_responses_total{prometheus_labels(method=method, route=route, status=status)} {value}")
+    
+    with command_metrics._lock:
+        latency = dict(command_metrics.latency)
+        failures = dict(command_metrics.failures)
+        slow = dict(command_metrics.slow)
+    lines += ["# HELP mongodb_command_duration_seconds MongoDB command latency", "# TYPE mongodb_command_duration_seconds histogram"]
+    for (collection, command), histogram in sorted(latency.items()):
+        prometheus_histogram(lines, "mongodb_command_duration_seconds", histogram, collection=collection, command=command)
+    lines += ["# HELP mongodb_command_failures_total Failed MongoDB commands", "# TYPE mongodb_command_failures_total counter"]
+    for (collection, command), value in sorted(failures.items()):
+        lines.append(f"mongodb_command_failures_total{prometheus_labels(collection=collection, command=command)} {value}")
+    lines += [f"# HELP mongodb_slow_commands_total MongoDB commands slower than {SLOW_QUERY_MS}ms", "# TYPE mongodb_slow_commands_total counter"]
+    for (collection, command), value in sorted(slow.items()):
+        lines.append(f"mongodb_slow_commands_total{prometheus_labels(collection=collection, command=command)} {value}")
+    
+    gauges = {
+        "user_cache_size": user_cache.stats()['size'],
+        "user_cache_hits_total": user_cache.hits,
+        "user_cache_misses_total": user_cache.misses,
+        "user_cache_evictions_total": user_cache.evictions,
+        "notification_outbox_pending": notification_outbox.stats()['pending'],
+        "notification_outbox_lag_seconds": notification_outbox.lag(),
+        "notification_outbox_dispatched_total": notification_outbox.dispatched,
+        "notification_outbox_retried_total": notification_outbox.retried,
+        "notification_outbox_dropped_total": notification_outbox.dropped,
+        "notification_streams": notification_hub.stats()['streams'],
+        "sla_escalated_total": sla_escalator.escalated,
+        "invalidation_events_published_total": invalidation_bus.published,
+        "invalidation_events_received_total": invalidation_bus.received,
+        "invalidation_events_dropped_total": invalidation_bus.dropped,
+    }
+    for name, value in gauges.items():
+        lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+app_state = {"started": False, "indexes": False}
+background_tasks: List[asyncio.Task] = []
+
+async def retry_indexes():
+    # A failed build at startup (e.g. the primary was stepping down) is retried until it lands
+    while not app_state['indexes']:
+        await asyncio.sleep(INDEX_RETRY_SECONDS)
+        app_state['indexes'] = await ensure_indexes()
+    logger.info("Indexes ensured after retry")
+
+async def startup_db_client():
+    # Open and warm the connection pool before taking traffic
+    try:
+        await client.admin.command("ping")
+    except PyMongoError:
+        logger.exception("MongoDB is not reachable; readiness will report it")
+    app_state['indexes'] = await ensure_indexes()
+    if not app_state['indexes']:
+        background_tasks.append(asyncio.create_task(retry_indexes()))
+    try:
+        await backfill_dedup_keys()
+    except Exception:
+        logger.exception("Failed to backfill complaint dedup keys")
+    try:
+        await get_analytics_summary()
+    except Exception:
+        logger.exception("Failed to build analytics summary")
+    try:
+        await backfill_notification_retention()
+    except Exception:
+        logger.exception("Failed to backfill notification retention")
+    try:
+        await backfill_log_actors()
+    except Exception:
+        logger.exception("Failed to backfill worker log actors")
+    try:
+        await ensure_worker_rollups()
+    except Exception:
+        logger.exception("Failed to build worker productivity rollups")
+    try:
+        await assignment_engine.load()
+    except Exception:
+        logger.exception("Failed to load worker assignment index")
+    try:
+        await invalidation_bus.start()
+    except PyMongoError:
+        logger.exception("Failed to start invalidation bus; caches stay process-local")
+    notification_outbox.start()
+    sla_escalator.start()
+    background_tasks.append(asyncio.create_task(reload_assignment_engine()))
+    app_state['started'] = True
+
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    app_state['started'] = False
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    await sla_escalator.stop()
+    await notification_outbox.stop()
+    await invalidation_bus.stop()
+    client.close()
+    password_executor.shutdown(wait=False)
\ No newline at end of file
@@ -0,0 +1,19 @@
+import axios from "axios";
+
+// Matches MAX_PAGE_SIZE on the server
+const PAGE_SIZE = 500;
+
+// List endpoints are keyset paginated; follow X-Next-Cursor until the last
+// page so dashboards never silently drop older rows.
+export async function fetchAllPages(url, params = {}) {
+  const rows = [];
+  let cursor = null;
+  do {
+    const response = await axios.get(url, {
+      params: { ...params, limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+    });
+    rows.push(...response.data);
+    cursor = response.headers["x-next-cursor"];
+  } while (cursor);
+  return rows;
+}
@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { useAuth } from "../../App";
+import { fetchAllPages } from "../../lib/pagination";
 import { Button } from "../../components/ui/button";
 import {
   Tabs,
@@ -78,13 +79,13 @@ export default function AdminDashboard() {
 
   const fetchData = async () => {
     try {
-      const [complaintsRes, workersRes, analyticsRes] = await Promise.all([
-        axios.get(`${API}/admin/complaints`),
-        axios.get(`${API}/admin/workers`),
+      const [complaintsData, workersData, analyticsRes] = await Promise.all([
+        fetchAllPages(`${API}/admin/complaints`, { fields: "description" }),
+        fetchAllPages(`${API}/admin/workers`),
         axios.get(`${API}/admin/analytics`),
       ]);
-      setComplaints(complaintsRes.data);
-      setWorkers(workersRes.data);
+      setComplaints(complaintsData);
+      setWorkers(workersData);
       setAnalytics(analyticsRes.data);
     } catch (error) {
       toast.error("Failed to fetch data");
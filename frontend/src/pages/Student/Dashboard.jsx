@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { useAuth } from "../../App";
+import { fetchAllPages } from "../../lib/pagination";
 import { Button } from "../../components/ui/button";
 import {
   Dialog,
@@ -97,8 +98,7 @@ export default function StudentDashboard() {
 
   const fetchComplaints = async () => {
     try {
-      const response = await axios.get(`${API}/resident/complaints`);
-      setComplaints(response.data);
+      setComplaints(await fetchAllPages(`${API}/resident/complaints`));
     } catch (error) {
       toast.error("Failed to fetch complaints");
     } finally {
@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { useAuth } from "../../App";
+import { fetchAllPages } from "../../lib/pagination";
 import { Button } from "../../components/ui/button";
 import {
   Dialog,
@@ -44,8 +45,11 @@ export default function WorkerDashboard() {
 
   const fetchTasks = async () => {
     try {
-      const response = await axios.get(`${API}/worker/tasks`);
-      setTasks(response.data);
+      setTasks(
+        await fetchAllPages(`${API}/worker/tasks`, {
+          fields: "description,resolution",
+        })
+      );
     } catch (error) {
       toast.error("Failed to fetch tasks");
     } finally {
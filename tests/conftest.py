@@ -0,0 +1,13 @@
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# server.py reads these at import time and Motor connects lazily, so unit
+# tests import it without a database. Always overridden, never inherited, so
+# a developer's shell can never point the tests at a real database; the
+# Mongo-backed tests skip unless TEST_MONGO_URL is set.
+os.environ["MONGO_URL"] = os.environ.get("TEST_MONGO_URL") or "mongodb://localhost:27017"
+os.environ["DB_NAME"] = os.environ.get("TEST_DB_NAME") or "unit_test"
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+CREATED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def complaint(**fields):
+    doc = {"id": "c1", "category": "Plumbing", "floor": "2", "representative_id": None, "created_at": CREATED}
+    doc.update(fields)
+    return doc
+
+
+def apply(summary, *deltas):
+    for delta in deltas:
+        for field, value in delta.items():
+            summary[field] = summary.get(field, 0) + value
+    return {field: value for field, value in summary.items() if value}
+
+
+def test_create_counts_total_and_status():
+    delta = server.analytics_delta(complaint(), None, "Pending")
+    assert delta == {"total": 1, "category.Plumbing.total": 1, "floor.2.total": 1, "status.Pending": 1}
+
+
+def test_linked_complaints_are_not_counted():
+    assert server.analytics_delta(complaint(representative_id="rep"), None, "Pending") == {}
+
+
+def test_same_status_is_a_no_op():
+    assert server.analytics_delta(complaint(status="Assigned"), "Assigned", "Assigned") == {}
+
+
+def test_complete_records_resolution():
+    resolved_at = CREATED + timedelta(hours=5)
+    delta = server.analytics_delta(complaint(), "Completed - Awaiting Admin Review", "Completed", resolved_at)
+    assert delta == {
+        "status.Completed - Awaiting Admin Review": -1,
+        "status.Completed": 1,
+        "category.Plumbing.resolved": 1,
+        "floor.2.resolved": 1,
+        "resolution.count": 1,
+        "resolution.total_hours": 5,
+        f"resolution.buckets.{server.resolution_bucket(5)}": 1,
+    }
+
+
+def test_leaving_completed_takes_the_resolution_back():
+    resolved_at = CREATED + timedelta(hours=5)
+    completed = complaint(status="Completed", resolved_at=resolved_at)
+    summary = apply({}, server.analytics_delta(complaint(), None, "Pending"))
+    summary = apply(summary, server.analytics_delta(complaint(), "Pending", "Completed", resolved_at))
+    summary = apply(summary, server.analytics_delta(completed, "Completed", "Rejected"))
+    assert summary == {"total": 1, "category.Plumbing.total": 1, "floor.2.total": 1, "status.Rejected": 1}
+
+
+def test_leaving_completed_with_legacy_string_timestamps():
+    completed = complaint(
+        status="Completed",
+        created_at=CREATED.isoformat(),
+        resolved_at=(CREATED + timedelta(hours=30)).isoformat()
+    )
+    delta = server.analytics_delta(completed, "Completed", "RequestedChanges")
+    assert delta["resolution.count"] == -1
+    assert delta["resolution.total_hours"] == pytest.approx(-30)
+    assert delta[f"resolution.buckets.{server.resolution_bucket(30)}"] == -1
+
+
+def test_recompleting_moves_the_histogram_entry():
+    completed = complaint(status="Completed", resolved_at=CREATED + timedelta(hours=5))
+    delta = server.analytics_delta(completed, "Completed", "Completed", CREATED + timedelta(hours=30))
+    assert delta == {
+        "resolution.total_hours": 25,
+        f"resolution.buckets.{server.resolution_bucket(5)}": -1,
+        f"resolution.buckets.{server.resolution_bucket(30)}": 1,
+    }
+
+
+@pytest.mark.parametrize("hours, bucket", [
+    (-3, "0"), (0, "0"), (0.5, "0"), (1, "1"), (23.9, "5"), (24, "6"), (719, "11"), (720, "12"), (5000, "12"),
+])
+def test_resolution_bucket(hours, bucket):
+    assert server.resolution_bucket(hours) == bucket
+
+
+def test_histogram_percentile_interpolates_inside_the_bucket():
+    buckets = {"0": 10, "1": 10}
+    assert server.histogram_percentile(buckets, 20, 0.25) == pytest.approx(0.5)
+    assert server.histogram_percentile(buckets, 20, 0.75) == pytest.approx(1.5)
+
+
+def test_histogram_percentile_edges():
+    assert server.histogram_percentile({}, 0, 0.5) == 0
+    last = str(len(server.RESOLUTION_BUCKET_HOURS) - 1)
+    assert server.histogram_percentile({last: 4}, 4, 0.9) == server.RESOLUTION_BUCKET_HOURS[-1]
+
+
+def mongo_bucket(hours):
+    # What $bucket returns as _id: the lower boundary, or the default past the last
+    boundaries = server.RESOLUTION_BUCKET_HOURS
+    for lower, upper in zip(boundaries, boundaries[1:]):
+        if lower <= hours < upper:
+            return lower
+    return "overflow"
+
+
+def test_rebuilt_buckets_match_incremental_buckets():
+    hours = [0, 0.2, 1, 3, 7.5, 12, 47, 71.9, 168, 719.99, 720, 1000]
+    rows = {}
+    for value in hours:
+        row = rows.setdefault(mongo_bucket(value), {"count": 0, "total_hours": 0})
+        row["count"] += 1
+        row["total_hours"] += value
+    result = {
+        "status": [{"_id": "Completed", "count": len(hours)}],
+        "category": [],
+        "floor": [],
+        "resolution": [{"_id": bucket, **row} for bucket, row in rows.items()],
+    }
+
+    summary = server.summary_from_facets(result)
+
+    expected = {}
+    for value in hours:
+        bucket = server.resolution_bucket(value)
+        expected[bucket] = expected.get(bucket, 0) + 1
+    assert summary["resolution"]["buckets"] == expected
+    assert summary["resolution"]["count"] == len(hours)
+    assert summary["resolution"]["total_hours"] == pytest.approx(sum(hours))
+    assert summary["total"] == len(hours)
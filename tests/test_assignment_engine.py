@@ -0,0 +1,97 @@
+import heapq
+
+import server
+
+
+def engine(*workers):
+    # (worker_id, specialization, open_tasks) without touching Mongo
+    result = server.AssignmentEngine()
+    for worker_id, specialization, open_tasks in workers:
+        result.add_worker(worker_id, specialization, open_tasks)
+    result.loaded = True
+    return result
+
+
+def test_recommends_least_loaded_specialist():
+    assignments = engine(("p1", "plumber", 3), ("p2", "plumber", 1), ("e1", "electrician", 0))
+    assert assignments.recommend("Plumbing") == "p2"
+    assert assignments.recommend("Electrical") == "e1"
+
+
+def test_adjust_invalidates_stale_heap_entries():
+    assignments = engine(("p1", "plumber", 0), ("p2", "plumber", 1))
+    assignments.adjust("p1", 2)
+    assert assignments.open_tasks("p1") == 2
+    assert assignments.recommend("Plumbing") == "p2"
+    assignments.adjust("p2", 5)
+    assert assignments.recommend("Plumbing") == "p1"
+
+
+def test_adjust_never_goes_negative():
+    assignments = engine(("p1", "plumber", 1))
+    assignments.adjust("p1", -3)
+    assert assignments.open_tasks("p1") == 0
+
+
+def test_adjust_ignores_unknown_workers():
+    assignments = engine(("p1", "plumber", 1))
+    assignments.adjust("ghost", 1)
+    assert assignments.open_tasks("ghost") is None
+
+
+def test_set_open_tasks_is_absolute_and_idempotent():
+    assignments = engine(("p1", "plumber", 0), ("p2", "plumber", 2))
+    assignments.set_open_tasks("p1", 4)
+    assignments.set_open_tasks("p1", 4)
+    assert assignments.open_tasks("p1") == 4
+    assert assignments.recommend("Plumbing") == "p2"
+    assignments.set_open_tasks("p1", -1)
+    assert assignments.open_tasks("p1") == 0
+    assert assignments.recommend("Plumbing") == "p1"
+
+
+def test_on_transition_moves_load_between_workers():
+    assignments = engine(("p1", "plumber", 1), ("p2", "plumber", 0))
+    assignments.on_transition("p1", "Assigned", "p2", "Assigned")
+    assert (assignments.open_tasks("p1"), assignments.open_tasks("p2")) == (0, 1)
+    assignments.on_transition("p2", "Assigned", "p2", "Completed - Awaiting Admin Review")
+    assert assignments.open_tasks("p2") == 0
+
+
+def test_mapped_category_never_falls_back_to_other_trades():
+    assignments = engine(("e1", "electrician", 0))
+    assert assignments.recommend("Plumbing") is None
+
+
+def test_unmapped_category_falls_back_to_anyone():
+    assignments = engine(("e1", "electrician", 2), ("c1", "carpenter", 1))
+    assert assignments.recommend("Painting") == "c1"
+    assert assignments.recommend(None) == "c1"
+
+
+def test_specialist_changes_are_seen_through_the_global_heap():
+    assignments = engine(("e1", "electrician", 0), ("c1", "carpenter", 1))
+    assignments.adjust("e1", 3)
+    assert assignments.recommend("Painting") == "c1"
+
+
+def test_compact_drops_stale_entries():
+    assignments = engine(("p1", "plumber", 0), ("p2", "plumber", 0))
+    for _ in range(10):
+        assignments.adjust("p1", 1)
+    assert len(assignments._heaps["plumber"]) > 2
+
+    assignments._compact("plumber")
+
+    assert sorted(assignments._heaps["plumber"]) == [(0, "p2"), (10, "p1")]
+    assert assignments.recommend("Plumbing") == "p2"
+
+
+def test_heaps_compact_themselves_when_they_grow():
+    assignments = engine(("p1", "plumber", 0))
+    limit = 4 * len(assignments.workers) + 64
+    for _ in range(limit * 2):
+        assignments.adjust("p1", 1)
+    assert len(assignments._heaps["plumber"]) <= limit + 1
+    assert len(assignments._heaps["*"]) <= limit + 1
+    assert heapq.nsmallest(1, assignments._heaps["plumber"]) == [(limit * 2, "p1")]
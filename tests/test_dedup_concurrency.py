@@ -0,0 +1,82 @@
+"""Concurrency check for common-area complaint deduplication.
+
+Fires many simultaneous common-area submissions for the same location at
+create_complaint and verifies that exactly one open representative exists
+and that its count matches the number of submissions.
+
+Needs a scratch MongoDB and is skipped without one. The database is dropped
+before and after the test, so TEST_DB_NAME must end in a scratch suffix and
+must not be the DB_NAME configured in backend/.env.
+
+    TEST_MONGO_URL=mongodb://localhost:27017 TEST_DB_NAME=dedup_test \\
+        python -m pytest tests/test_dedup_concurrency.py
+"""
+import asyncio
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+SCRATCH_SUFFIXES = ("_bench", "_test", "_scratch")
+SUBMISSIONS = int(os.environ.get("TEST_DEDUP_SUBMISSIONS", "300"))
+
+TEST_MONGO_URL = os.environ.get("TEST_MONGO_URL")
+TEST_DB_NAME = os.environ.get("TEST_DB_NAME") or "unit_test"
+
+if not TEST_MONGO_URL:
+    pytest.skip("TEST_MONGO_URL is not set", allow_module_level=True)
+
+from dotenv import dotenv_values  # noqa: E402
+
+if TEST_DB_NAME == dotenv_values(BACKEND_DIR / ".env").get("DB_NAME"):
+    pytest.skip(f"{TEST_DB_NAME} is the database configured in backend/.env", allow_module_level=True)
+if not TEST_DB_NAME.endswith(SCRATCH_SUFFIXES):
+    pytest.skip(f"TEST_DB_NAME must end in one of {', '.join(SCRATCH_SUFFIXES)}", allow_module_level=True)
+
+# conftest.py points server.py at TEST_MONGO_URL / TEST_DB_NAME before import
+import server  # noqa: E402
+
+if server.db.name != TEST_DB_NAME:
+    pytest.skip(f"server is connected to {server.db.name}, not {TEST_DB_NAME}", allow_module_level=True)
+
+
+async def submit_concurrently(submissions: int):
+    await server.client.drop_database(server.db.name)
+    await server.ensure_indexes()
+
+    residents = [
+        {"id": str(uuid.uuid4()), "role": "resident", "email": f"resident{i}@example.com", "full_name": f"Resident {i}"}
+        for i in range(submissions)
+    ]
+    payload = server.ComplaintCreate(
+        complaint_type="common_area",
+        floor="2",
+        category="Plumbing",
+        subcategory="Broken pipe",
+        description="Washroom pipe burst"
+    )
+
+    try:
+        results = await asyncio.gather(
+            *(server.create_complaint(payload, current_user=resident) for resident in residents),
+            return_exceptions=True
+        )
+        representatives = await server.db.complaints.find(
+            {"representative_id": None, "floor": "2", "category": "Plumbing", "subcategory": "Broken pipe"},
+            {"_id": 0, "id": 1, "count": 1, "priority": 1}
+        ).to_list(None)
+        linked = await server.db.complaints.count_documents({"representative_id": {"$ne": None}})
+    finally:
+        await server.client.drop_database(server.db.name)
+    return results, representatives, linked
+
+
+def test_concurrent_submissions_share_one_representative():
+    results, representatives, linked = asyncio.run(submit_concurrently(SUBMISSIONS))
+
+    assert [result for result in results if isinstance(result, Exception)] == []
+    assert len(representatives) == 1
+    assert representatives[0]['count'] == SUBMISSIONS
+    assert linked == SUBMISSIONS - 1
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+START = datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc)
+
+
+def matches(doc, query):
+    # Just the operators sla_windows emits
+    for field, condition in query.items():
+        value = doc.get(field)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        for op, operand in condition.items():
+            if op == "$in" and value not in operand:
+                return False
+            if op == "$nin" and value in operand:
+                return False
+            if op == "$lte" and not value <= operand:
+                return False
+            if op == "$gt" and not value > operand:
+                return False
+    return True
+
+
+def scan(complaint, since, until):
+    # Priorities the scan would assign: one per matching window
+    return [priority for query, priority in server.sla_windows(since, until) if matches(complaint, query)]
+
+
+def complaint(category, created_at, priority="Low"):
+    return {
+        "representative_id": None, "status": "Pending", "category": category,
+        "created_at": created_at, "priority": priority
+    }
+
+
+@pytest.mark.parametrize("category", ["Plumbing", "Cleaning", "Carpentry", "Painting"])
+def test_each_threshold_is_crossed_in_exactly_one_scan(category):
+    sla = server.CATEGORY_SLA_HOURS.get(category, server.DEFAULT_SLA_HOURS)
+    doc = complaint(category, START)
+    # Uneven scan intervals, some landing exactly on a threshold
+    watermarks = [START]
+    step = timedelta(minutes=37)
+    while watermarks[-1] < START + timedelta(hours=sla * 5):
+        watermarks.append(watermarks[-1] + step)
+    watermarks.extend(START + timedelta(hours=sla * multiple) for multiple, _ in server.SLA_ESCALATION_STEPS)
+    watermarks = sorted(set(watermarks))
+
+    # Priority stays Low so only the window bounds, not the priority filter,
+    # keep a threshold from matching twice
+    crossings = []
+    for since, until in zip(watermarks, watermarks[1:]):
+        crossings.extend((priority, until) for priority in scan(doc, since, until))
+
+    assert crossings == [
+        (priority, START + timedelta(hours=sla * multiple)) for multiple, priority in server.SLA_ESCALATION_STEPS
+    ]
+
+
+def test_threshold_on_the_watermark_belongs_to_the_earlier_scan():
+    sla = server.CATEGORY_SLA_HOURS["Plumbing"]
+    doc = complaint("Plumbing", START)
+    threshold = START + timedelta(hours=sla)
+    assert scan(doc, threshold - timedelta(minutes=5), threshold) == ["Medium"]
+    assert scan(doc, threshold, threshold + timedelta(minutes=5)) == []
+
+
+def test_first_scan_catches_the_backlog():
+    sla = server.CATEGORY_SLA_HOURS["Electrical"]
+    now = START + timedelta(hours=sla * 10)
+    old = complaint("Electrical", START)
+    matched = scan(old, None, now)
+    assert set(matched) == {priority for _, priority in server.SLA_ESCALATION_STEPS}
+    assert server.sla_priority(old, now) == "Urgent"
+
+
+def test_first_scan_skips_complaints_within_their_sla():
+    sla = server.CATEGORY_SLA_HOURS["Electrical"]
+    now = START + timedelta(hours=sla - 1)
+    assert scan(complaint("Electrical", START), None, now) == []
+
+
+def test_already_escalated_or_closed_complaints_do_not_match():
+    sla = server.CATEGORY_SLA_HOURS["Plumbing"]
+    since, until = START + timedelta(hours=sla - 1), START + timedelta(hours=sla + 1)
+    assert scan(complaint("Plumbing", START, priority="High"), since, until) == []
+    closed = complaint("Plumbing", START)
+    closed["status"] = "Completed"
+    assert scan(closed, since, until) == []
+    linked = complaint("Plumbing", START)
+    linked["representative_id"] = "rep"
+    assert scan(linked, since, until) == []
+
+
+def test_sla_priority_steps():
+    sla = server.CATEGORY_SLA_HOURS["Cleaning"]
+    doc = complaint("Cleaning", START)
+    assert server.sla_priority(doc, START + timedelta(hours=sla) - timedelta(seconds=1)) is None
+    assert server.sla_priority(doc, START + timedelta(hours=sla)) == "Medium"
+    assert server.sla_priority(doc, START + timedelta(hours=sla * 2)) == "High"
+    assert server.sla_priority(doc, START + timedelta(hours=sla * 4)) == "Urgent"